@@ -0,0 +1,4 @@
+"""
+Pytest configuration: its location puts the repository root on sys.path,
+so tests import the core and metrics packages when run with plain pytest.
+"""
@@ -7,17 +7,169 @@ Easy to extend with new metrics or fields.
 """
 
 import numpy as np
-from dataclasses import dataclass, asdict
-from typing import Dict
+from dataclasses import dataclass, field, fields
+from enum import IntEnum
+from typing import ClassVar, Dict, Optional
 
 
-@dataclass
+# Video file name -> small integer id, shared by all segments in the process
+_VIDEO_ID_INTERN: Dict[str, int] = {}
+
+
+def intern_video_file(video_file: str) -> int:
+    """Get the integer id for a video file name, assigning one if new"""
+    return _VIDEO_ID_INTERN.setdefault(video_file, len(_VIDEO_ID_INTERN))
+
+
+def seconds_to_ns(seconds: float) -> int:
+    """Convert a time in seconds to integer nanoseconds"""
+    return round(seconds * 1_000_000_000)
+
+
+class CategoryEnum(IntEnum):
+    """
+    Base class for categorical metrics stored as small ints.
+    
+    Each member has a string label - the value the metric modules report
+    and the index files contain. Labels are the lower-case member names
+    unless listed explicitly in _CATEGORY_LABELS.
+    """
+    
+    @property
+    def label(self) -> str:
+        """String label of this category"""
+        return _CATEGORY_LABELS[type(self)][self]
+    
+    @classmethod
+    def from_label(cls, label: str) -> 'CategoryEnum':
+        """Get the member for a string label"""
+        return _CATEGORY_BY_LABEL[cls][label]
+
+
+class CameraMoveType(CategoryEnum):
+    """Camera movement types (see metrics.cinematic.CameraMovement)"""
+    STATIC = 0
+    PAN_LEFT = 1
+    PAN_RIGHT = 2
+    TILT_UP = 3
+    TILT_DOWN = 4
+    ZOOM_IN = 5
+    ZOOM_OUT = 6
+    DOLLY_IN = 7
+    DOLLY_OUT = 8
+    ROTATION_CW = 9
+    ROTATION_CCW = 10
+    HANDHELD = 11
+    COMPLEX = 12
+
+
+class StabilizationType(CategoryEnum):
+    """Camera support / stabilization types"""
+    UNKNOWN = 0
+    TRIPOD = 1
+    GIMBAL = 2
+    HANDHELD_STABILIZED = 3
+    HANDHELD_UNSTABILIZED = 4
+
+
+class LightingType(CategoryEnum):
+    """Lighting setup types"""
+    NATURAL = 0
+    UNKNOWN = 1
+    GOLDEN_HOUR = 2
+    BLUE_HOUR = 3
+    HIGH_KEY = 4
+    LOW_KEY = 5
+    BACKLIT = 6
+    THREE_POINT = 7
+    MOTIVATED = 8
+
+
+class ColorGradingStyle(CategoryEnum):
+    """Color grading profiles"""
+    NEUTRAL = 0
+    WARM = 1
+    COOL = 2
+    DESATURATED = 3
+    VIBRANT = 4
+    MONOCHROME = 5
+    TEAL_ORANGE = 6
+    VINTAGE = 7
+
+
+class ExposureClass(CategoryEnum):
+    """Exposure classes"""
+    PROPERLY_EXPOSED = 0
+    UNDEREXPOSED = 1
+    OVEREXPOSED = 2
+
+
+class ShotFramingType(CategoryEnum):
+    """Shot sizes"""
+    MEDIUM = 0
+    EXTREME_CLOSE_UP = 1
+    CLOSE_UP = 2
+    WIDE = 3
+    EXTREME_WIDE = 4
+    INSERT = 5
+    UNKNOWN = 6
+
+
+# Enum class -> labels indexed by member value
+_CATEGORY_LABELS = {
+    cls: tuple(member.name.lower() for member in cls)
+    for cls in (StabilizationType, LightingType, ColorGradingStyle,
+                ExposureClass, ShotFramingType)
+}
+_CATEGORY_LABELS[CameraMoveType] = (
+    "Static", "Pan Left", "Pan Right", "Tilt Up", "Tilt Down",
+    "Zoom In", "Zoom Out", "Dolly In", "Dolly Out",
+    "Rotation CW", "Rotation CCW", "Handheld/Shake", "Complex Movement"
+)
+
+# Enum class -> label -> member (precomputed reverse map)
+_CATEGORY_BY_LABEL = {
+    cls: {label: cls(value) for value, label in enumerate(labels)}
+    for cls, labels in _CATEGORY_LABELS.items()
+}
+
+
+# Bits of ScoreMetrics.flags, one per boolean metric
+FLAG_FOCUS_HAS_CHANGE = 1 << 0
+FLAG_FOCUS_HAS_BOKEH = 1 << 1
+FLAG_LIGHTING_IS_DRAMATIC = 1 << 2
+FLAG_EXPOSURE_IS_WELL_EXPOSED = 1 << 3
+FLAG_SHOT_FOLLOWS_RULE_OF_THIRDS = 1 << 4
+
+
+def _flag_property(bit: int) -> property:
+    """Boolean property backed by one bit of the flags field"""
+    def getter(self) -> bool:
+        return bool(self.flags & bit)
+    
+    def setter(self, value: bool):
+        self.flags = (self.flags | bit) if value else (self.flags & ~bit)
+    
+    return property(getter, setter)
+
+
+def _to_py(value):
+    """Convert a numpy scalar to the equivalent native Python value"""
+    item = getattr(value, 'item', None)
+    return item() if item is not None else value
+
+
+@dataclass(slots=True)
 class ScoreMetrics:
     """
     All available scoring metrics for a video segment.
     
     Each metric is scored from 0.0 (worst) to 1.0 (best).
     Add new metrics by simply adding new fields here.
+    
+    Boolean metrics are properties over bits of the single flags field
+    (declared as ClassVar so they are not dataclass fields), which keeps
+    them cheap to store and lets bulk queries test them with one AND.
     """
     # Basic visual metrics
     sharpness: float = 0.0
@@ -30,71 +182,128 @@ class ScoreMetrics:
     center_focus_score: float = 0.0
     
     # Cinematic metrics - Camera Movement
-    camera_movement_type: str = "Static"
+    camera_movement_type: CameraMoveType = CameraMoveType.STATIC
     camera_movement_quality: float = 0.0
     camera_movement_smoothness: float = 0.0
     camera_movement_confidence: float = 0.0
     
     # Cinematic metrics - Stabilization
-    stabilization_type: str = "unknown"
+    stabilization_type: StabilizationType = StabilizationType.UNKNOWN
     stabilization_score: float = 0.0
     
     # Cinematic metrics - Focus
-    focus_has_change: bool = False
+    focus_has_change: ClassVar[property] = _flag_property(FLAG_FOCUS_HAS_CHANGE)
     focus_change_amount: float = 0.0
     focus_sharpness: float = 0.0
-    focus_has_bokeh: bool = False
+    focus_has_bokeh: ClassVar[property] = _flag_property(FLAG_FOCUS_HAS_BOKEH)
     
     # Cinematic metrics - Lighting
-    lighting_type: str = "natural"
+    lighting_type: LightingType = LightingType.NATURAL
     lighting_quality: float = 0.0
-    lighting_is_dramatic: bool = False
+    lighting_is_dramatic: ClassVar[property] = _flag_property(FLAG_LIGHTING_IS_DRAMATIC)
     
     # Cinematic metrics - Color Grading
-    color_grading_style: str = "neutral"
+    color_grading_style: ColorGradingStyle = ColorGradingStyle.NEUTRAL
     color_grading_strength: float = 0.0
     color_saturation: float = 0.0
     color_warmth: float = 0.0
     
     # Cinematic metrics - Exposure
-    exposure_quality: str = "properly_exposed"
+    exposure_quality: ExposureClass = ExposureClass.PROPERLY_EXPOSED
     exposure_score: float = 0.0
-    exposure_is_well_exposed: bool = True
+    exposure_is_well_exposed: ClassVar[property] = _flag_property(FLAG_EXPOSURE_IS_WELL_EXPOSED)
     
     # Cinematic metrics - Shot Framing
-    shot_framing_type: str = "medium"
+    shot_framing_type: ShotFramingType = ShotFramingType.MEDIUM
     shot_composition_score: float = 0.0
-    shot_follows_rule_of_thirds: bool = False
+    shot_follows_rule_of_thirds: ClassVar[property] = _flag_property(FLAG_SHOT_FOLLOWS_RULE_OF_THIRDS)
+    
+    # Boolean metrics above, packed one per bit (FLAG_* constants)
+    flags: int = FLAG_EXPOSURE_IS_WELL_EXPOSED
     
     # Example: Add new metrics here
     # face_score: float = 0.0
     # smile_score: float = 0.0
     # symmetry_score: float = 0.0
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization"""
-        # Convert all values to native Python types (handle numpy types)
-        return {
-            key: float(value) if isinstance(value, (np.floating, np.integer)) else value
-            for key, value in asdict(self).items()
-        }
+    def __post_init__(self):
+        """Store native Python values so serialization needs no type checks"""
+        for key in _SCORE_FIELDS:
+            setattr(self, key, _to_py(getattr(self, key)))
+        
+        # Categories may be given as labels (index files) or ints
+        for key, enum_cls in _CATEGORY_FIELDS.items():
+            value = getattr(self, key)
+            if isinstance(value, str):
+                setattr(self, key, enum_cls.from_label(value))
+            elif type(value) is not enum_cls:
+                setattr(self, key, enum_cls(value))
+    
+    def to_dict(self, verbose: bool = False) -> Dict:
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Args:
+            verbose: Emit categorical metrics as string labels and the
+                flags field as the named booleans, instead of compact
+                int codes and one flags int
+        """
+        # Read fields directly - all values are scalars, so the deep copy
+        # done by dataclasses.asdict() is unnecessary
+        if verbose:
+            result = {key: getattr(self, key) for key in _METRIC_NAMES}
+            for key in _CATEGORY_FIELDS:
+                result[key] = result[key].label
+        else:
+            result = {key: getattr(self, key) for key in _SCORE_FIELDS}
+            for key in _CATEGORY_FIELDS:
+                result[key] = int(result[key])
+        return result
     
     @classmethod
     def from_dict(cls, data: Dict):
-        """Create ScoreMetrics from dictionary"""
-        return cls(**data)
+        """Create ScoreMetrics from dictionary (compact or verbose)"""
+        data = dict(data)
+        named_flags = {name: data.pop(name) for name in _FLAG_NAMES if name in data}
+        
+        metrics = cls(**data)
+        for name, value in named_flags.items():
+            setattr(metrics, name, value)
+        return metrics
     
     def get_metric_names(self) -> list:
         """Get list of all available metric names"""
-        return list(self.__dict__.keys())
+        return list(_METRIC_NAMES)
 
 
-@dataclass
+# Field names in declaration order (ScoreMetrics has no __dict__)
+_SCORE_FIELDS = tuple(f.name for f in fields(ScoreMetrics))
+
+# Boolean metrics stored as bits of ScoreMetrics.flags
+_FLAG_NAMES = tuple(
+    name for name, value in vars(ScoreMetrics).items() if isinstance(value, property)
+)
+
+# Metric names as exported, with the flag bits at their declared positions
+_METRIC_NAMES = tuple(name for name in ScoreMetrics.__annotations__ if name != 'flags')
+
+# Categorical field name -> its CategoryEnum class
+_CATEGORY_FIELDS = {
+    f.name: f.type for f in fields(ScoreMetrics)
+    if isinstance(f.type, type) and issubclass(f.type, CategoryEnum)
+}
+
+
+@dataclass(slots=True)
 class VideoSegment:
     """
     Stores information about a video segment (e.g., 1-second clip).
     
     Contains timing information and all calculated metrics.
+    
+    Integer keys for the video file and the time range are derived once at
+    construction so overlap checks compare ints instead of strings and
+    floats. Treat the timing fields as read-only after construction.
     """
     video_file: str           # Name of the source video file
     start_time: float         # Start time in seconds
@@ -102,16 +311,52 @@ class VideoSegment:
     duration: float          # Duration in seconds
     metrics: ScoreMetrics    # All calculated metrics
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization"""
+    # Derived integer keys (not serialized)
+    video_file_id: int = field(init=False, repr=False, compare=False)
+    start_ns: int = field(init=False, repr=False, compare=False)
+    end_ns: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Derive the integer video id and nanosecond time keys"""
+        self.video_file_id = intern_video_file(self.video_file)
+        self.start_ns = seconds_to_ns(self.start_time)
+        self.end_ns = seconds_to_ns(self.end_time)
+    
+    def __reduce__(self):
+        """Pickle through __init__ so the video id is re-interned on load"""
+        return (self.__class__, (self.video_file, self.start_time, self.end_time,
+                                 self.duration, self.metrics))
+    
+    def to_dict(self, verbose: bool = False) -> Dict:
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Args:
+            verbose: Emit categorical metrics as string labels
+        """
         return {
             'video_file': self.video_file,
             'start_time': float(self.start_time),
             'end_time': float(self.end_time),
             'duration': float(self.duration),
-            'metrics': self.metrics.to_dict()
+            'metrics': self.metrics.to_dict(verbose)
         }
     
+    def to_tuple(self) -> tuple:
+        """
+        Convert to a flat tuple for bulk export to columnar stores.
+        
+        Returns:
+            (video_file, start_time, end_time, duration, *metric values),
+            with metrics in ScoreMetrics field order and categorical
+            metrics as their int codes
+        """
+        metrics = self.metrics
+        return (
+            self.video_file, float(self.start_time), float(self.end_time),
+            float(self.duration), *[getattr(metrics, key) for key in _SCORE_FIELDS]
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict):
         """Create VideoSegment from dictionary"""
@@ -127,18 +372,23 @@ class VideoSegment:
         """
         Check if this segment overlaps with another segment.
         
+        For bulk passes over many segments use
+        core.segment_index.SegmentOverlapIndex instead of calling this
+        for every pair.
+        
         Args:
             other: Another VideoSegment to check against
             
         Returns:
             True if segments overlap, False otherwise
         """
-        # Must be from the same video
-        if self.video_file != other.video_file:
-            return False
-        
-        # Segments overlap if one starts before the other ends
-        return not (self.end_time <= other.start_time or self.start_time >= other.end_time)
+        # Same video, and each segment starts before the other ends.
+        # Non-short-circuit & keeps this a straight run of int compares.
+        return (
+            (self.video_file_id == other.video_file_id)
+            & (self.start_ns < other.end_ns)
+            & (other.start_ns < self.end_ns)
+        )
 
 
 @dataclass
@@ -148,6 +398,7 @@ class VideoMetadata:
     file_path: str          # Full path to video file
     indexed: bool           # Whether indexing was successful
     error: str = None       # Error message if indexing failed
+    fingerprint: Optional[bytes] = None  # Content fingerprint (core.fingerprint)
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -158,6 +409,8 @@ class VideoMetadata:
         }
         if self.error:
             result['error'] = self.error
+        if self.fingerprint:
+            result['fingerprint'] = self.fingerprint.hex()
         return result
 
 
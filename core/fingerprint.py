@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Fingerprint Module
+
+Identifies video files by content instead of by path, so cached results
+stay valid when a file is moved or renamed.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+# Bytes read from each end of a video file
+FINGERPRINT_CHUNK = 1 << 20
+
+# Digest size in bytes
+FINGERPRINT_SIZE = 16
+
+
+def video_fingerprint(video_path: Path) -> bytes:
+    """
+    Compute a cheap content fingerprint for a video file.
+
+    Hashes the file size, modification time and the first and last
+    megabyte instead of the whole file. The container header and index
+    live at the ends of the file, so re-encoded, truncated or replaced
+    videos are detected without reading gigabytes per run.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    stat = Path(video_path).stat()
+
+    digest = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    with open(video_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_CHUNK))
+
+        # Tail, without re-reading bytes already hashed as the head
+        if stat.st_size > FINGERPRINT_CHUNK:
+            f.seek(max(stat.st_size - FINGERPRINT_CHUNK, FINGERPRINT_CHUNK))
+            digest.update(f.read(FINGERPRINT_CHUNK))
+
+    return digest.digest()
+
+
+# Example usage:
+#
+# fingerprint = video_fingerprint(Path("video.mp4"))
+# print(fingerprint.hex())
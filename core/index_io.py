@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Index I/O Module
+
+Saves and loads the complete video index. The format follows the file
+extension: .msgpack/.mpk files use compact binary MessagePack,
+.ndjson/.jsonl files are newline-delimited JSON streamed one segment per
+line, .parquet files store one typed column per metric (requires
+pyarrow), anything else is written as human-readable JSON.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .data_models import VideoSegment
+from .segment_io import (
+    read_parquet_metadata,
+    read_segments_parquet,
+    segments_to_arrow,
+    write_batches_parquet,
+)
+
+
+# File extensions written as MessagePack instead of JSON
+MSGPACK_SUFFIXES = {'.msgpack', '.mpk'}
+
+# File extensions written as newline-delimited JSON, one segment per line
+NDJSON_SUFFIXES = {'.ndjson', '.jsonl'}
+
+# File extensions written as columnar Parquet
+PARQUET_SUFFIXES = {'.parquet'}
+
+
+def _require_msgpack():
+    """Import msgpack, with a clear message when it is not installed"""
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "MessagePack index files require msgpack (pip install msgpack)"
+        ) from e
+    return msgpack
+
+
+def _np_encoder(obj):
+    """Convert numpy values that msgpack cannot pack natively"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+def _dumps_line(obj) -> bytes:
+    """Serialize one NDJSON line (orjson when installed, else json)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_np_encoder) + b'\n'
+    return json.dumps(obj, default=_np_encoder).encode() + b'\n'
+
+
+def _loads_line(line: bytes):
+    """Parse one NDJSON line (orjson when installed, else json)"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _pack_segments(segments: List[Dict]) -> Dict:
+    """
+    Store segment dicts as rows of values plus one shared field list.
+
+    Metrics become a list of values in field-declaration order, so the
+    ~30 metric names are written once instead of once per segment.
+    """
+    if not segments:
+        return {'metric_fields': [], 'rows': []}
+
+    metric_fields = list(segments[0]['metrics'])
+
+    return {
+        'metric_fields': metric_fields,
+        'rows': [
+            [
+                seg['video_file'], seg['start_time'], seg['end_time'], seg['duration'],
+                [seg['metrics'][name] for name in metric_fields]
+            ]
+            for seg in segments
+        ]
+    }
+
+
+def _unpack_segments(packed: Dict) -> List[Dict]:
+    """Rebuild segment dicts from _pack_segments() output"""
+    metric_fields = packed['metric_fields']
+
+    return [
+        {
+            'video_file': video_file,
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration': duration,
+            'metrics': dict(zip(metric_fields, values))
+        }
+        for video_file, start_time, end_time, duration, values in packed['rows']
+    ]
+
+
+def dump_index(path: Path, index: Dict):
+    """
+    Save an index dictionary.
+
+    Args:
+        path: Output file (.msgpack/.mpk for MessagePack, .ndjson/.jsonl
+            for newline-delimited JSON, .parquet for Parquet, else JSON)
+        index: Index with 'metadata', 'videos' and 'segments' entries
+    """
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+
+    suffix = path.suffix.lower()
+
+    if suffix in PARQUET_SUFFIXES:
+        segments = [VideoSegment.from_dict(seg) for seg in index['segments']]
+        write_batches_parquet([segments_to_arrow(segments)], path, metadata={
+            'metadata': index['metadata'], 'videos': index['videos']
+        })
+    elif suffix in NDJSON_SUFFIXES:
+        with open(path, 'wb') as f:
+            for segment in index['segments']:
+                f.write(_dumps_line(segment))
+            f.write(_dumps_line({'metadata': index['metadata'], 'videos': index['videos']}))
+    elif suffix in MSGPACK_SUFFIXES:
+        msgpack = _require_msgpack()
+
+        packed = dict(index)
+        packed['segments'] = _pack_segments(index['segments'])
+
+        with open(path, 'wb') as f:
+            f.write(msgpack.packb(packed, default=_np_encoder, use_bin_type=True))
+    else:
+        # Write JSON with indentation for readability
+        with open(path, 'w') as f:
+            json.dump(index, f, indent=2)
+
+
+def load_index(path: Path) -> Dict:
+    """
+    Load an index saved by dump_index().
+
+    Args:
+        path: Index file (.msgpack/.mpk for MessagePack, .ndjson/.jsonl
+            for newline-delimited JSON, .parquet for Parquet, else JSON)
+
+    Returns:
+        Index dictionary in the same shape for every format
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in PARQUET_SUFFIXES:
+        index = read_parquet_metadata(path) or {'metadata': {}, 'videos': {}}
+        index['segments'] = [seg.to_dict(verbose=True) for seg in read_segments_parquet(path)]
+        return index
+
+    if suffix in NDJSON_SUFFIXES:
+        index = {'segments': []}
+        with open(path, 'rb') as f:
+            for line in f:
+                record = _loads_line(line)
+                if 'metadata' in record:
+                    index.update(record)
+                else:
+                    index['segments'].append(record)
+        return index
+
+    if suffix in MSGPACK_SUFFIXES:
+        msgpack = _require_msgpack()
+
+        with open(path, 'rb') as f:
+            index = msgpack.unpackb(f.read(), raw=False)
+
+        index['segments'] = _unpack_segments(index['segments'])
+        return index
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def iter_index_segments(path: Path) -> Iterator[Dict]:
+    """
+    Yield the segment dicts of an NDJSON index one line at a time.
+
+    Only one segment is held in memory, so this scales to indexes too
+    large for load_index().
+
+    Args:
+        path: .ndjson/.jsonl index file
+
+    Yields:
+        Segment dicts (VideoSegment.to_dict() format), in file order
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            record = _loads_line(line)
+            if 'metadata' not in record:
+                yield record
+
+
+class IndexWriter:
+    """
+    Writes an index incrementally, one video's segments at a time.
+
+    NDJSON files are streamed: segments are written as they are added and
+    the metadata and video records go on the last line, so peak memory is
+    one video's segments. Parquet files keep each video's segments as a
+    compact Arrow record batch and write them all, with the metadata in
+    the file's key-value metadata, on close(). JSON and MessagePack cannot
+    be appended to, so their segment dicts are buffered until close().
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open the output file.
+
+        Args:
+            path: Output file, format chosen by extension as in dump_index()
+        """
+        self.path = Path(path)
+        self.segment_count = 0
+
+        self._file = None
+        self._segments = []
+        self._batches = None
+
+        suffix = self.path.suffix.lower()
+        if suffix in PARQUET_SUFFIXES:
+            self._batches = []
+        elif suffix in NDJSON_SUFFIXES:
+            self.path.parent.mkdir(exist_ok=True, parents=True)
+            self._file = open(self.path, 'wb')
+
+    def add_segments(self, segments: List[VideoSegment]):
+        """
+        Add the segments of one video.
+
+        Args:
+            segments: Segments to write, in order
+        """
+        self.segment_count += len(segments)
+
+        if self._batches is not None:
+            if segments:
+                self._batches.append(segments_to_arrow(segments))
+            return
+
+        if self._file is None:
+            self._segments.extend(seg.to_dict(verbose=True) for seg in segments)
+            return
+
+        write = self._file.write
+        for seg in segments:
+            write(_dumps_line(seg.to_dict(verbose=True)))
+
+    def close(self, metadata: Dict, videos: Dict) -> Dict:
+        """
+        Write the metadata and video records and close the file.
+
+        Args:
+            metadata: IndexMetadata.to_dict() of the finished index
+            videos: Video file name -> VideoMetadata.to_dict()
+
+        Returns:
+            The index dictionary; its 'segments' entry is omitted for
+            NDJSON and Parquet files, whose segments are not kept as dicts
+        """
+        index = {'metadata': metadata, 'videos': videos}
+
+        if self._batches is not None:
+            batches = self._batches or [segments_to_arrow([])]
+            write_batches_parquet(batches, self.path, metadata=index)
+            return index
+
+        if self._file is None:
+            index['segments'] = self._segments
+            dump_index(self.path, index)
+            return index
+
+        self._file.write(_dumps_line(index))
+        self._file.close()
+        return index
+
+
+# Example usage:
+#
+# dump_index(Path("video_index.msgpack"), index)
+# index = load_index(Path("video_index.msgpack"))
+# segments = [VideoSegment.from_dict(s) for s in index['segments']]
+#
+# # Columnar index; load just the metrics a query needs with pyarrow
+# dump_index(Path("video_index.parquet"), index)
+#
+# # Stream a large index one segment at a time
+# for segment in iter_index_segments(Path("video_index.ndjson")):
+#     print(segment['video_file'], segment['start_time'])
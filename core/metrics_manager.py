@@ -5,11 +5,16 @@ Coordinates all individual metric modules.
 Automatically discovers and loads all available metrics.
 """
 
+import functools
 import numpy as np
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import List, Dict, Optional
 from pathlib import Path
 
 from metrics import (
+    FrameViews,
+    detect_edges,
     SharpnessMetric,
     BrightnessMetric,
     ContrastMetric,
@@ -31,6 +36,33 @@ from metrics.cinematic import (
 )
 
 
+class MetricID(IntEnum):
+    """
+    Position of each metric in MetricsManager._metrics_by_id.
+    
+    Member names are the upper-case metrics dict keys.
+    """
+    SHARPNESS = 0
+    BRIGHTNESS = 1
+    CONTRAST = 2
+    COLOR_VIBRANCY = 3
+    MOTION = 4
+    COMPOSITION = 5
+    PERSON_DETECTION = 6
+    CAMERA_MOVEMENT = 7
+    STABILIZATION = 8
+    FOCUS_CHANGE = 9
+    LIGHTING_TYPE = 10
+    COLOR_GRADING = 11
+    EXPOSURE = 12
+    SHOT_FRAMING = 13
+
+
+# Single-frame scalar metrics that support calculate_batch(); the segment
+# processor stores their scores in this column order
+BATCH_METRICS = ('sharpness', 'brightness', 'contrast', 'color_vibrancy', 'composition')
+
+
 class MetricsManager:
     """
     Manages all metric calculations including cinematic metrics.
@@ -39,8 +71,17 @@ class MetricsManager:
     a unified interface for calculating them.
     """
     
-    def __init__(self):
-        """Initialize all metric calculators"""
+    def __init__(self, use_cinematic: bool = True, person_model: Optional[str] = None):
+        """
+        Initialize all metric calculators.
+        
+        Args:
+            use_cinematic: Also load the cinematic metrics (default: True).
+                Basic-only pipelines can skip them; their calculate_*
+                methods are then unavailable.
+            person_model: ONNX SSD model for person detection instead of
+                HOG (see PersonDetectionMetric; default: HOG)
+        """
         # Initialize basic metrics
         self.metrics = {
             'sharpness': SharpnessMetric(),
@@ -49,10 +90,11 @@ class MetricsManager:
             'color_vibrancy': ColorVibrancyMetric(),
             'motion': MotionMetric(),
             'composition': CompositionMetric(),
-            'person_detection': PersonDetectionMetric(),
+            'person_detection': PersonDetectionMetric(person_model),
         }
         
         # Initialize cinematic metrics
+        self.use_cinematic = use_cinematic
         self.cinematic_metrics = {
             'camera_movement': CameraMovementMetric(),
             'stabilization': StabilizationMetric(),
@@ -61,10 +103,21 @@ class MetricsManager:
             'color_grading': ColorGradingMetric(),
             'exposure': ExposureMetric(),
             'shot_framing': ShotFramingMetric(),
-        }
+        } if use_cinematic else {}
         
         # Merge all metrics
         self.metrics.update(self.cinematic_metrics)
+        
+        # Metric instances indexed by MetricID, used by the calculate_*
+        # methods so hot loops do a tuple load instead of a dict lookup.
+        # self.metrics stays the public name -> metric mapping.
+        # Metrics that were not loaded are None.
+        self._metrics_by_id = tuple(
+            self.metrics.get(metric_id.name.lower()) for metric_id in MetricID
+        )
+        
+        # Worker threads for OpenCV kernels that release the GIL
+        self._executor = ThreadPoolExecutor(max_workers=4)
     
     def get_available_metrics(self) -> List[str]:
         """
@@ -97,67 +150,150 @@ class MetricsManager:
         }
     
     # Basic metric methods
-    def calculate_sharpness(self, frame: np.ndarray) -> float:
+    def calculate_sharpness(self, frame: np.ndarray, **views) -> float:
         """Calculate sharpness metric"""
-        return self.metrics['sharpness'].calculate(frame)
+        return self._metrics_by_id[MetricID.SHARPNESS].calculate(frame, **views)
     
-    def calculate_brightness(self, frame: np.ndarray) -> float:
+    def calculate_brightness(self, frame: np.ndarray, **views) -> float:
         """Calculate brightness metric"""
-        return self.metrics['brightness'].calculate(frame)
+        return self._metrics_by_id[MetricID.BRIGHTNESS].calculate(frame, **views)
     
-    def calculate_contrast(self, frame: np.ndarray) -> float:
+    def calculate_contrast(self, frame: np.ndarray, **views) -> float:
         """Calculate contrast metric"""
-        return self.metrics['contrast'].calculate(frame)
+        return self._metrics_by_id[MetricID.CONTRAST].calculate(frame, **views)
     
-    def calculate_color_vibrancy(self, frame: np.ndarray) -> float:
+    def calculate_color_vibrancy(self, frame: np.ndarray, **views) -> float:
         """Calculate color vibrancy metric"""
-        return self.metrics['color_vibrancy'].calculate(frame)
+        return self._metrics_by_id[MetricID.COLOR_VIBRANCY].calculate(frame, **views)
     
-    def calculate_motion(self, frame: np.ndarray, prev_frame: np.ndarray) -> float:
+    def calculate_motion(self, frame: np.ndarray, prev_frame: np.ndarray, **views) -> float:
         """Calculate motion metric (requires previous frame)"""
-        return self.metrics['motion'].calculate(frame, prev_frame=prev_frame)
+        return self._metrics_by_id[MetricID.MOTION].calculate(frame, prev_frame=prev_frame, **views)
     
-    def calculate_composition(self, frame: np.ndarray) -> float:
+    def calculate_composition(self, frame: np.ndarray, **views) -> float:
         """Calculate composition metric"""
-        return self.metrics['composition'].calculate(frame)
+        return self._metrics_by_id[MetricID.COMPOSITION].calculate(frame, **views)
     
-    def calculate_person_detection(self, frame: np.ndarray) -> tuple:
+    def calculate_person_detection(self, frame: np.ndarray, **views) -> tuple:
         """
         Calculate person detection metrics.
         
         Returns:
             Tuple of (person_score, center_focus_score)
         """
-        return self.metrics['person_detection'].calculate(frame)
+        return self._metrics_by_id[MetricID.PERSON_DETECTION].calculate(frame, **views)
+    
+    def calculate_person_detection_batch(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Calculate person detection metrics for a stack of frames.
+        
+        The HOG detector releases the GIL, so frames are detected
+        concurrently on the worker threads; an SSD model takes the whole
+        stack in one inference call.
+        
+        Returns:
+            Array of shape (N, 2) of (person_score, center_focus_score)
+        """
+        return self._metrics_by_id[MetricID.PERSON_DETECTION].calculate_batch(
+            frames, executor=self._executor
+        )
+    
+    def calculate_motion_batch(self, frames: np.ndarray, gray: np.ndarray,
+                               rows: np.ndarray, pixel_scale: float = 1.0) -> np.ndarray:
+        """
+        Calculate motion between consecutive frames of a stack.
+        
+        Each pair is independent once the gray stack exists, and optical
+        flow releases the GIL, so the pairs run on the worker threads.
+        
+        Args:
+            frames: Stack of frames, shape (N, H, W, 3) (BGR format)
+            gray: Grayscale stack, shape (N, H, W)
+            rows: Indices of the frames to score, each against the frame
+                before it (so never 0)
+            pixel_scale: Native-resolution pixels per pixel of the frames
+                (default: 1.0), for stacks that were downscaled
+            
+        Returns:
+            Array of motion scores, one per entry of rows
+        """
+        motion = self._metrics_by_id[MetricID.MOTION]
+        
+        def calculate(i):
+            return motion.calculate(frames[i], prev_frame=frames[i - 1],
+                                    gray=gray[i], prev_gray=gray[i - 1],
+                                    pixel_scale=pixel_scale)
+        
+        return np.array(list(self._executor.map(calculate, rows)), dtype=np.float32)
     
     # Cinematic metric methods
-    def calculate_camera_movement(self, frame: np.ndarray, prev_frame: np.ndarray) -> dict:
+    def calculate_camera_movement(self, frame: np.ndarray, prev_frame: np.ndarray, **views) -> dict:
         """Calculate camera movement analysis"""
-        return self.metrics['camera_movement'].calculate(frame, prev_frame=prev_frame)
+        return self._metrics_by_id[MetricID.CAMERA_MOVEMENT].calculate(frame, prev_frame=prev_frame, **views)
     
-    def calculate_stabilization(self, frame: np.ndarray, prev_frame: np.ndarray) -> dict:
+    def calculate_stabilization(self, frame: np.ndarray, prev_frame: np.ndarray, **views) -> dict:
         """Calculate stabilization quality"""
-        return self.metrics['stabilization'].calculate(frame, prev_frame=prev_frame)
+        return self._metrics_by_id[MetricID.STABILIZATION].calculate(frame, prev_frame=prev_frame, **views)
     
-    def calculate_focus_change(self, frame: np.ndarray, prev_frame: np.ndarray = None) -> dict:
+    def calculate_focus_change(self, frame: np.ndarray, prev_frame: np.ndarray = None, **views) -> dict:
         """Calculate focus change detection"""
-        return self.metrics['focus_change'].calculate(frame, prev_frame=prev_frame)
+        return self._metrics_by_id[MetricID.FOCUS_CHANGE].calculate(frame, prev_frame=prev_frame, **views)
     
-    def calculate_lighting_type(self, frame: np.ndarray) -> dict:
+    def calculate_lighting_type(self, frame: np.ndarray, **views) -> dict:
         """Calculate lighting type classification"""
-        return self.metrics['lighting_type'].calculate(frame)
+        return self._metrics_by_id[MetricID.LIGHTING_TYPE].calculate(frame, **views)
     
-    def calculate_color_grading(self, frame: np.ndarray) -> dict:
+    def calculate_color_grading(self, frame: np.ndarray, **views) -> dict:
         """Calculate color grading style"""
-        return self.metrics['color_grading'].calculate(frame)
+        return self._metrics_by_id[MetricID.COLOR_GRADING].calculate(frame, **views)
     
-    def calculate_exposure(self, frame: np.ndarray) -> dict:
+    def calculate_exposure(self, frame: np.ndarray, **views) -> dict:
         """Calculate exposure quality"""
-        return self.metrics['exposure'].calculate(frame)
+        return self._metrics_by_id[MetricID.EXPOSURE].calculate(frame, **views)
     
-    def calculate_shot_framing(self, frame: np.ndarray) -> dict:
+    def calculate_shot_framing(self, frame: np.ndarray, **views) -> dict:
         """Calculate shot framing type"""
-        return self.metrics['shot_framing'].calculate(frame)
+        return self._metrics_by_id[MetricID.SHOT_FRAMING].calculate(frame, **views)
+    
+    def calculate_cinematic_for_frame(self, frame: np.ndarray, prev_frame: np.ndarray,
+                                      camera_movement: bool = True,
+                                      **views) -> Dict[str, dict]:
+        """
+        Calculate all cinematic metrics for a frame concurrently.
+        
+        The metrics only read the frame and its shared views, and spend
+        most of their time in OpenCV code that releases the GIL (optical
+        flow, color reductions), so the four color metrics run on the
+        worker threads while the flow-based ones run on the calling thread.
+        
+        Args:
+            frame: Current frame
+            prev_frame: Previous sampled frame
+            camera_movement: Also calculate camera movement (default: True);
+                when False it is left out of the results
+            **views: Precomputed views of the frame (gray, hsv, lab,
+                prev_gray, l_stats) and pixel_scale for downscaled frames
+            
+        Returns:
+            Dictionary of cinematic metric name -> result dict
+        """
+        submit = self._executor.submit
+        futures = {
+            'lighting_type': submit(self.calculate_lighting_type, frame, **views),
+            'color_grading': submit(self.calculate_color_grading, frame, **views),
+            'exposure': submit(self.calculate_exposure, frame, **views),
+            'shot_framing': submit(self.calculate_shot_framing, frame, **views),
+        }
+        
+        results = {
+            'stabilization': self.calculate_stabilization(frame, prev_frame, **views),
+            'focus_change': self.calculate_focus_change(frame, prev_frame, **views),
+        }
+        if camera_movement:
+            results['camera_movement'] = self.calculate_camera_movement(frame, prev_frame, **views)
+        results.update((name, future.result()) for name, future in futures.items())
+        
+        return results
     
     def calculate_all_for_frame(self, frame: np.ndarray, 
                                prev_frame: np.ndarray = None) -> Dict[str, float]:
@@ -171,28 +307,90 @@ class MetricsManager:
         Returns:
             Dictionary of metric_name -> score
         """
-        results = {}
+        # Convert the frame once for all metrics
+        views = FrameViews.from_frame(frame).as_kwargs()
         
-        # Calculate single-frame metrics
-        results['sharpness'] = self.calculate_sharpness(frame)
-        results['brightness'] = self.calculate_brightness(frame)
-        results['contrast'] = self.calculate_contrast(frame)
-        results['color_vibrancy'] = self.calculate_color_vibrancy(frame)
-        results['composition'] = self.calculate_composition(frame)
+        # Single-frame metrics are independent and spend most of their time
+        # in OpenCV/NumPy code that releases the GIL, so run them on the
+        # worker threads
+        submit = self._executor.submit
+        futures = {
+            'sharpness': submit(self.calculate_sharpness, frame, **views),
+            'brightness': submit(self.calculate_brightness, frame, **views),
+            'contrast': submit(self.calculate_contrast, frame, **views),
+            'color_vibrancy': submit(self.calculate_color_vibrancy, frame, **views),
+            'composition': submit(self.calculate_composition, frame, **views),
+            'person_detection': submit(self.calculate_person_detection, frame),
+        }
         
-        # Calculate motion (requires previous frame)
+        # Calculate motion (requires previous frame) on the calling thread
         if prev_frame is not None:
-            results['motion'] = self.calculate_motion(frame, prev_frame)
+            motion = self.calculate_motion(frame, prev_frame, gray=views['gray'])
         else:
-            results['motion'] = 0.0
+            motion = 0.0
         
-        # Calculate person detection (returns two scores)
-        person_score, center_focus = self.calculate_person_detection(frame)
+        results = {
+            name: futures[name].result()
+            for name in ('sharpness', 'brightness', 'contrast', 'color_vibrancy', 'composition')
+        }
+        results['motion'] = motion
+        
+        # Person detection returns two scores
+        person_score, center_focus = futures['person_detection'].result()
         results['person_score'] = person_score
         results['center_focus_score'] = center_focus
         
         return results
     
+    def calculate_batch(self, frames: np.ndarray, names: Optional[List[str]] = None,
+                        **views) -> Dict[str, np.ndarray]:
+        """
+        Calculate single-frame scalar metrics for a stack of frames.
+        
+        Each metric processes the whole stack in one call, which amortizes
+        Python dispatch over all frames.
+        
+        Args:
+            frames: Stack of video frames, shape (N, H, W, 3) (BGR format)
+            names: Metrics to calculate (default: all batchable metrics -
+                sharpness, brightness, contrast, color_vibrancy, composition)
+            **views: Precomputed view stacks shared by the metrics, e.g.
+                gray=array of shape (N, H, W)
+            
+        Returns:
+            Dictionary of metric_name -> array of N scores
+        """
+        if names is None:
+            names = BATCH_METRICS
+        
+        # Sharpness and composition filter each frame separately, spread
+        # over the worker threads
+        kwargs = {
+            'sharpness': {'executor': self._executor},
+            'composition': {'executor': self._executor},
+        }
+        
+        return {
+            name: self.metrics[name].calculate_batch(frames, **views, **kwargs.get(name, {}))
+            for name in names
+        }
+    
+    def detect_edges(self, gray: np.ndarray, rows: Optional[np.ndarray] = None,
+                     pixel_scale: float = 1.0) -> np.ndarray:
+        """
+        Canny edge maps shared by composition and shot framing.
+        
+        Args:
+            gray: Stack of grayscale frames, shape (N, H, W)
+            rows: Boolean mask of the frames that need edges (default: all)
+            pixel_scale: Native-resolution pixels per pixel of the frames
+                (default: 1.0), for stacks that were downscaled
+            
+        Returns:
+            Stack of edge maps, shape (N, H, W); frames outside rows are empty
+        """
+        return detect_edges(gray, rows, executor=self._executor, pixel_scale=pixel_scale)
+    
     def print_available_metrics(self):
         """Print information about all available metrics"""
         print("\n" + "="*60)
@@ -214,13 +412,43 @@ class MetricsManager:
         print("\n" + "="*60)
 
 
+def get_metrics_manager(use_cinematic: bool = True,
+                        person_model: Optional[str] = None) -> MetricsManager:
+    """
+    Get the shared MetricsManager for this process.
+    
+    Building a MetricsManager instantiates every metric (including the
+    person detector), so it is created once per configuration and
+    reused by all SegmentProcessor instances.
+    
+    Args:
+        use_cinematic: Whether the manager loads the cinematic metrics
+        person_model: Optional ONNX person detector model path
+    
+    Returns:
+        The process-wide MetricsManager instance for this configuration
+    """
+    # Normalize the arguments so get_metrics_manager() and
+    # get_metrics_manager(True) share one cache entry
+    return _shared_metrics_manager(bool(use_cinematic),
+                                   str(person_model) if person_model else None)
+
+
+@functools.lru_cache(maxsize=4)
+def _shared_metrics_manager(use_cinematic: bool, person_model: Optional[str]) -> MetricsManager:
+    """Build the MetricsManager for one configuration (cached)"""
+    return MetricsManager(use_cinematic, person_model)
+
+
 # Example of how to add a new metric:
 # 
 # 1. Create new file: metrics/my_new_metric.py
 # 2. Import in metrics/__init__.py
 # 3. Add to MetricsManager.__init__():
 #    self.metrics['my_metric'] = MyNewMetric()
-# 4. Add convenience method (optional):
-#    def calculate_my_metric(self, frame):
-#        return self.metrics['my_metric'].calculate(frame)
-# 5. Update calculate_all_for_frame() to include it
+# 4. Add a MetricID member named after the dict key:
+#    MY_METRIC = 14
+# 5. Add convenience method (optional):
+#    def calculate_my_metric(self, frame, **views):
+#        return self._metrics_by_id[MetricID.MY_METRIC].calculate(frame, **views)
+# 6. Update calculate_all_for_frame() to include it
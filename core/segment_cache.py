@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Segment Cache Module
+
+Persists calculated segment metrics in a SQLite database so re-indexing
+an unchanged video skips metric calculation for every cached segment.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from .data_models import ScoreMetrics
+
+
+# Bump whenever a metric calculation changes so older cache entries
+# are no longer returned
+METRIC_VERSION = 15
+
+
+class SegmentCache:
+    """
+    On-disk cache of ScoreMetrics keyed by (video fingerprint, start, end).
+
+    Entries written under a different METRIC_VERSION are ignored, so
+    bumping the version invalidates the whole cache.
+    """
+
+    def __init__(self, db_path: Path, metric_version: int = METRIC_VERSION):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to SQLite database file
+            metric_version: Version stored with and required of entries
+        """
+        self.db_path = Path(db_path)
+        self.metric_version = metric_version
+
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        # Parallel indexing workers each open their own connection; WAL
+        # lets them read while another writes, and the timeout waits out
+        # brief write locks instead of failing. put() opens a transaction
+        # that holds the write lock until commit(), so writers commit after
+        # every batch of puts.
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segment_cache ("
+            " video_hash BLOB NOT NULL,"
+            " start_time REAL NOT NULL,"
+            " end_time REAL NOT NULL,"
+            " metric_version INTEGER NOT NULL,"
+            " metrics TEXT NOT NULL,"
+            " PRIMARY KEY (video_hash, start_time, end_time, metric_version))"
+        )
+
+    def get(self, video_hash: bytes, start_time: float,
+            end_time: float) -> Optional[ScoreMetrics]:
+        """
+        Look up cached metrics for a segment.
+
+        Args:
+            video_hash: Fingerprint from core.fingerprint.video_fingerprint()
+            start_time: Segment start in seconds
+            end_time: Segment end in seconds
+
+        Returns:
+            Cached ScoreMetrics, or None on a miss
+        """
+        row = self._conn.execute(
+            "SELECT metrics FROM segment_cache"
+            " WHERE video_hash = ? AND start_time = ? AND end_time = ?"
+            " AND metric_version = ?",
+            (video_hash, start_time, end_time, self.metric_version)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return ScoreMetrics.from_dict(json.loads(row[0]))
+
+    def put(self, video_hash: bytes, start_time: float, end_time: float,
+            metrics: ScoreMetrics):
+        """
+        Store metrics for a segment (call commit() to persist).
+
+        Args:
+            video_hash: Fingerprint from core.fingerprint.video_fingerprint()
+            start_time: Segment start in seconds
+            end_time: Segment end in seconds
+            metrics: Calculated metrics for the segment
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO segment_cache VALUES (?, ?, ?, ?, ?)",
+            (video_hash, start_time, end_time, self.metric_version,
+             json.dumps(metrics.to_dict()))
+        )
+
+    def commit(self):
+        """Write pending entries to disk"""
+        self._conn.commit()
+
+    def close(self):
+        """Commit pending entries and close the database"""
+        self._conn.commit()
+        self._conn.close()
+
+
+# Example usage:
+#
+# from core.fingerprint import video_fingerprint
+#
+# cache = SegmentCache(Path(".cache/segments.db"))
+# video_hash = video_fingerprint(Path("video.mp4"))
+#
+# metrics = cache.get(video_hash, 0.0, 1.0)
+# if metrics is None:
+#     metrics = processor.process_segment(frames)
+#     cache.put(video_hash, 0.0, 1.0, metrics)
+# cache.close()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Segment Index Module
+
+Answers overlap queries over large collections of video segments.
+Replaces pairwise VideoSegment.overlaps_with() scans in bulk passes
+(deduplication, non-max suppression) with sorted per-video arrays.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+
+from .data_models import VideoSegment
+
+
+class SegmentOverlapIndex:
+    """
+    Overlap index over a list of video segments.
+
+    Segments are grouped by interned video id and sorted by their integer
+    nanosecond start keys. A query is two binary searches plus a vectorized
+    check over the few segments that can overlap, so bulk passes cost
+    O(N log N + M) instead of the O(N^2) of calling overlaps_with() on
+    every pair.
+    """
+
+    def __init__(self, segments: List[VideoSegment]):
+        """
+        Build the index.
+
+        Args:
+            segments: Segments to index (from any number of videos)
+        """
+        self.segments = list(segments)
+
+        by_video: Dict[int, List[int]] = {}
+        for i, segment in enumerate(self.segments):
+            by_video.setdefault(segment.video_file_id, []).append(i)
+
+        # video_file_id -> (sorted starts, matching ends, segment ids, max length)
+        self._groups = {}
+        for video_file_id, ids in by_video.items():
+            ids = np.array(ids, dtype=np.int64)
+            starts = np.array([self.segments[i].start_ns for i in ids], dtype=np.int64)
+            ends = np.array([self.segments[i].end_ns for i in ids], dtype=np.int64)
+
+            order = np.argsort(starts, kind='stable')
+            max_length = int((ends - starts).max())
+            self._groups[video_file_id] = (starts[order], ends[order], ids[order], max_length)
+
+    def _query(self, video_file_id: int, start_ns: int, end_ns: int) -> np.ndarray:
+        """Ids of indexed segments overlapping [start_ns, end_ns) in a video"""
+        group = self._groups.get(video_file_id)
+        if group is None:
+            return np.empty(0, dtype=np.int64)
+
+        starts, ends, ids, max_length = group
+
+        # Segments starting at or after the query end cannot overlap, and
+        # neither can ones starting max_length or more before the query start
+        hi = np.searchsorted(starts, end_ns, side='left')
+        lo = np.searchsorted(starts, start_ns - max_length, side='right')
+
+        return ids[lo:hi][ends[lo:hi] > start_ns]
+
+    def find_overlaps(self, segment: VideoSegment) -> List[VideoSegment]:
+        """
+        Find all indexed segments that overlap a segment.
+
+        Args:
+            segment: Segment to check (does not need to be indexed)
+
+        Returns:
+            Overlapping segments, excluding the segment itself
+        """
+        ids = self._query(segment.video_file_id, segment.start_ns, segment.end_ns)
+
+        return [
+            self.segments[i] for i in ids.tolist()
+            if self.segments[i] is not segment
+        ]
+
+    def all_overlap_pairs(self) -> List[Tuple[int, int]]:
+        """
+        Find every pair of overlapping indexed segments.
+
+        Returns:
+            List of (i, j) positions into self.segments with i < j
+        """
+        pairs = []
+
+        for starts, ends, ids, _ in self._groups.values():
+            n = len(starts)
+
+            # Because starts are sorted, the segments overlapping the one at
+            # position p (and starting no earlier) are positions p+1 .. hi[p]-1
+            first = np.arange(1, n + 1)
+            hi = np.searchsorted(starts, ends, side='left')
+            counts = np.maximum(hi - first, 0)
+
+            left = np.repeat(np.arange(n), counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            right = np.repeat(first, counts) + offsets
+
+            # Drop zero-length segments that only touch the other start
+            keep = ends[right] > starts[left]
+            left_ids, right_ids = ids[left[keep]], ids[right[keep]]
+
+            pairs.extend(zip(
+                np.minimum(left_ids, right_ids).tolist(),
+                np.maximum(left_ids, right_ids).tolist()
+            ))
+
+        return sorted(pairs)
+
+
+# Example usage:
+#
+# index = SegmentOverlapIndex(segments)
+# duplicates = index.find_overlaps(segments[0])
+# for i, j in index.all_overlap_pairs():
+#     print(f"{segments[i].video_file}: segments {i} and {j} overlap")
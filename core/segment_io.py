@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Segment I/O Module
+
+Columnar export of video segments with Apache Arrow / Parquet.
+Each segment field becomes one typed column, which avoids building a
+Python dict per segment and encoding every float as JSON text.
+"""
+
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .data_models import ScoreMetrics, VideoSegment, _CATEGORY_FIELDS
+
+
+# Parquet key-value metadata entry holding index-level metadata as JSON
+INDEX_METADATA_KEY = b'video_index'
+
+
+def _require_pyarrow():
+    """Import pyarrow, with a clear message when it is not installed"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Arrow/Parquet export requires pyarrow (pip install pyarrow)"
+        ) from e
+    return pyarrow
+
+
+def _metric_types(pa) -> dict:
+    """Arrow type for each ScoreMetrics field, from its annotation"""
+    type_map = {
+        float: pa.float32(),
+        int: pa.uint32(),
+    }
+    category_type = pa.dictionary(pa.int8(), pa.string())
+
+    return {
+        f.name: category_type if f.name in _CATEGORY_FIELDS else type_map[f.type]
+        for f in fields(ScoreMetrics)
+    }
+
+
+def segments_to_arrow(segments: List[VideoSegment]):
+    """
+    Convert segments to an Arrow record batch, one column per field.
+
+    Timing fields keep float64; metric scores are stored as float32 and
+    categorical metrics (movement type, lighting, ...) are dictionary
+    encoded with their string labels.
+
+    Args:
+        segments: Segments to convert
+
+    Returns:
+        pyarrow.RecordBatch with one row per segment
+    """
+    pa = _require_pyarrow()
+
+    columns = {
+        'video_file': pa.array(
+            [s.video_file for s in segments], type=pa.string()
+        ).dictionary_encode(),
+        'start_time': pa.array([s.start_time for s in segments], type=pa.float64()),
+        'end_time': pa.array([s.end_time for s in segments], type=pa.float64()),
+        'duration': pa.array([s.duration for s in segments], type=pa.float64()),
+    }
+
+    for name, arrow_type in _metric_types(pa).items():
+        if name in _CATEGORY_FIELDS:
+            values = [getattr(s.metrics, name).label for s in segments]
+        else:
+            values = [getattr(s.metrics, name) for s in segments]
+        columns[name] = pa.array(values, type=arrow_type)
+
+    return pa.RecordBatch.from_pydict(columns)
+
+
+def write_segments_parquet(segments: List[VideoSegment], output_file: Path,
+                           compression: str = 'zstd', metadata: Optional[Dict] = None):
+    """
+    Write segments to a Parquet file.
+
+    Args:
+        segments: Segments to write
+        output_file: Output .parquet path
+        compression: Parquet compression codec (default: zstd)
+        metadata: Optional JSON-serializable index metadata, stored in
+            the file's key-value metadata (see read_parquet_metadata())
+    """
+    write_batches_parquet([segments_to_arrow(segments)], output_file,
+                          compression, metadata)
+
+
+def write_batches_parquet(batches: list, output_file: Path,
+                          compression: str = 'zstd', metadata: Optional[Dict] = None):
+    """
+    Write record batches from segments_to_arrow() to one Parquet file.
+
+    Args:
+        batches: pyarrow.RecordBatch objects (at least one)
+        output_file: Output .parquet path
+        compression: Parquet compression codec (default: zstd)
+        metadata: Optional JSON-serializable index metadata, stored in
+            the file's key-value metadata (see read_parquet_metadata())
+    """
+    pa = _require_pyarrow()
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(exist_ok=True, parents=True)
+
+    table = pa.Table.from_batches(batches)
+    if metadata is not None:
+        table = table.replace_schema_metadata({INDEX_METADATA_KEY: json.dumps(metadata)})
+    pa.parquet.write_table(table, str(output_file), compression=compression)
+
+
+def read_parquet_metadata(input_file: Path) -> Optional[Dict]:
+    """
+    Read the index metadata stored by write_segments_parquet().
+
+    Only the file footer is read, not the segment columns.
+
+    Args:
+        input_file: Path to .parquet file
+
+    Returns:
+        The metadata dictionary, or None if the file has none
+    """
+    pa = _require_pyarrow()
+
+    schema = pa.parquet.read_schema(str(input_file))
+    value = (schema.metadata or {}).get(INDEX_METADATA_KEY)
+    return json.loads(value) if value is not None else None
+
+
+def read_segments_parquet(input_file: Path) -> List[VideoSegment]:
+    """
+    Read segments back from a Parquet file written by write_segments_parquet().
+
+    Args:
+        input_file: Path to .parquet file
+
+    Returns:
+        List of VideoSegment objects
+    """
+    pa = _require_pyarrow()
+
+    rows = pa.parquet.read_table(str(input_file)).to_pylist()
+    metric_names = [f.name for f in fields(ScoreMetrics)]
+
+    return [
+        VideoSegment(
+            video_file=row['video_file'],
+            start_time=row['start_time'],
+            end_time=row['end_time'],
+            duration=row['duration'],
+            metrics=ScoreMetrics(**{name: row[name] for name in metric_names})
+        )
+        for row in rows
+    ]
+
+
+# Example usage:
+#
+# write_segments_parquet(segments, Path("video_index.parquet"))
+# segments = read_segments_parquet(Path("video_index.parquet"))
+#
+# # Or query the columns directly
+# import pyarrow.parquet as pq
+# table = pq.read_table("video_index.parquet", columns=['video_file', 'sharpness'])
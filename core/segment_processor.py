@@ -5,16 +5,111 @@ Processes video segments and aggregates metrics from individual frames.
 Uses the MetricsManager to calculate all metrics.
 """
 
+import cv2
 import numpy as np
-from typing import List
-import sys
-from pathlib import Path
+from collections import Counter
+from typing import List, Optional
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from metrics import FrameViews, LuminanceStats, convert_stack
 
-from core.data_models import ScoreMetrics
-from core.metrics_manager import MetricsManager
+from .data_models import (
+    ScoreMetrics,
+    CameraMoveType,
+    StabilizationType,
+    LightingType,
+    ColorGradingStyle,
+    ExposureClass,
+    ShotFramingType
+)
+from .metrics_manager import BATCH_METRICS, get_metrics_manager
+
+
+# ScoreMetrics field for each column of the score buffer; the first
+# columns hold the BATCH_METRICS, in their order
+SCORE_COLUMNS = (
+    'sharpness', 'brightness', 'contrast', 'color_vibrancy', 'composition_score',
+    'motion_score', 'person_score', 'center_focus_score'
+)
+MOTION_COL = 5
+PERSON_COL = 6
+
+# Value used for a column when no frame was sampled for it
+SCORE_DEFAULTS = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.5, 0.5])
+
+# Expensive single-frame metrics that are only recalculated when the
+# picture changes; unchanged frames reuse the last calculated score
+ADAPTIVE_METRICS = ('sharpness', 'composition')
+
+# Pixel stride of the thumbnails used for change detection
+THUMB_STRIDE = 16
+
+# Difference-hash bits that may differ for a sampled frame to reuse the
+# last person detection
+DHASH_MAX_DISTANCE = 4
+
+# Every FRAME_STEP-th frame of a segment is sampled for the metrics
+FRAME_STEP = 3
+
+# Camera movement is analyzed on every CAMERA_MOVEMENT_STRIDE-th cinematic
+# sample; the samples in between repeat the last analysis
+CAMERA_MOVEMENT_STRIDE = 2
+
+# Default long-edge size (pixels) sampled frames are downscaled to
+DOWNSCALE_LONG_EDGE = 720
+
+# Per-sample record of each cinematic metric: the keys of its result dict
+# that the segment aggregate reads, stored as one column per key
+CAMERA_MOVEMENT_DTYPE = np.dtype([
+    ('movement_type', 'U24'), ('cinematic_quality', 'f8'),
+    ('smoothness', 'f8'), ('confidence', 'f8')
+])
+STABILIZATION_DTYPE = np.dtype([
+    ('stabilization_type', 'U24'), ('stabilization_score', 'f8')
+])
+FOCUS_DTYPE = np.dtype([
+    ('has_focus_change', '?'), ('focus_change_amount', 'f8'),
+    ('current_sharpness', 'f8'), ('has_shallow_dof', '?')
+])
+LIGHTING_DTYPE = np.dtype([
+    ('dominant_type', 'U24'), ('quality_score', 'f8'), ('is_dramatic', '?')
+])
+COLOR_GRADING_DTYPE = np.dtype([
+    ('dominant_profile', 'U24'), ('grading_strength', 'f8'),
+    ('saturation_level', 'f8'), ('warmth_level', 'f8')
+])
+EXPOSURE_DTYPE = np.dtype([
+    ('exposure_class', 'U24'), ('exposure_quality', 'f8'), ('is_well_exposed', '?')
+])
+FRAMING_DTYPE = np.dtype([
+    ('shot_size', 'U24'), ('composition_score', 'f8'), ('follows_rule_of_thirds', '?')
+])
+
+
+def _store(records: np.ndarray, row: int, result: dict):
+    """Copy the recorded keys of a metric result dict into one record"""
+    records[row] = tuple(result[name] for name in records.dtype.names)
+
+
+def _dhash(gray: np.ndarray) -> int:
+    """
+    64-bit difference hash of a grayscale frame.
+    
+    Each bit tells whether a pixel of a 9x8 thumbnail is brighter than
+    its left neighbour, so the hash follows the coarse structure of the
+    picture and ignores noise and small brightness changes.
+    """
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(small[:, 1:] > small[:, :-1]).tobytes(), 'big')
+
+
+def _mode(labels: np.ndarray) -> str:
+    """
+    Most common label in a column of records.
+    
+    One counting pass without sorting; ties go to the label that
+    appeared first in the segment.
+    """
+    return Counter(labels.tolist()).most_common(1)[0][0]
 
 
 class SegmentProcessor:
@@ -25,9 +120,44 @@ class SegmentProcessor:
     all metrics calculated and averaged over the segment.
     """
     
-    def __init__(self):
-        """Initialize the segment processor with metrics manager"""
-        self.metrics_manager = MetricsManager()
+    def __init__(self, change_threshold: float = 1.0, use_cinematic: bool = True,
+                 downscale_long_edge: int = DOWNSCALE_LONG_EDGE,
+                 camera_movement_stride: int = CAMERA_MOVEMENT_STRIDE,
+                 person_model: Optional[str] = None):
+        """
+        Initialize the segment processor with the shared metrics manager.
+        
+        Args:
+            change_threshold: Mean absolute grayscale thumbnail difference (0-255)
+                below which a sampled frame counts as unchanged and reuses
+                the sharpness, composition and person scores of the last
+                changed frame. 0 recalculates every sampled frame.
+            use_cinematic: Calculate the cinematic metrics (default: True).
+                When False they keep their ScoreMetrics defaults.
+            downscale_long_edge: Sampled frames whose longer side exceeds
+                this many pixels are shrunk to it (INTER_AREA) before any
+                metric runs (default: 720). Flow-based metrics (motion,
+                camera movement, stabilization), Laplacian-based ones
+                (sharpness, focus change) and the shared Canny edges scale
+                their pixel measurements to the native resolution, so
+                their thresholds do not depend on it. 0 keeps the native
+                resolution.
+            camera_movement_stride: Analyze camera movement (dense optical
+                flow, the most expensive cinematic metric) on every n-th
+                cinematic sample only (default: 2). Movement rarely changes
+                between neighbouring samples, so the samples in between
+                reuse the last result. 1 analyzes every sample.
+            person_model: ONNX SSD model for person detection instead of
+                HOG (requires onnxruntime; default: HOG)
+        """
+        if camera_movement_stride < 1:
+            raise ValueError(f"camera_movement_stride must be at least 1, got {camera_movement_stride}")
+        
+        self.metrics_manager = get_metrics_manager(use_cinematic, person_model)
+        self.change_threshold = change_threshold
+        self.use_cinematic = use_cinematic
+        self.downscale_long_edge = downscale_long_edge
+        self.camera_movement_stride = camera_movement_stride
     
     def process_segment(self, frames: List[np.ndarray]) -> ScoreMetrics:
         """
@@ -37,114 +167,221 @@ class SegmentProcessor:
         optimize performance while maintaining accuracy.
         
         Args:
-            frames: List of video frames (BGR format) representing a segment
+            frames: List of video frames (BGR format) representing a segment;
+                frames larger than downscale_long_edge are downscaled first
             
         Returns:
             ScoreMetrics object with all calculated and averaged metrics
         """
+        return self.process_many([frames])[0]
+    
+    def process_many(self, segments: List[List[np.ndarray]],
+                     sampled: bool = False) -> List[ScoreMetrics]:
+        """
+        Calculate all metrics for several segments in one batched pass.
+        
+        Sampled frames of all segments are stacked together so each
+        single-frame metric runs once for the whole batch, and the scores
+        are then reduced per segment. Gives the same results as calling
+        process_segment() on each segment.
+        
+        Args:
+            segments: One list of frames per segment (BGR format, all
+                frames the same size - e.g. segments of one video)
+            sampled: The lists already hold only every FRAME_STEP-th frame,
+                as read by VideoReader.iterate_segments(..., frame_step=FRAME_STEP),
+                so they are used as they are
+            
+        Returns:
+            ScoreMetrics object for each segment, in input order
+        """
+        if not segments:
+            return []
+        
+        # Sample every 3rd frame (performance optimization) of each segment
+        # into one stack, remembering which segment each row came from
+        step = 1 if sampled else FRAME_STEP
+        n_sampled = np.array([-(-len(frames) // step) for frames in segments], dtype=np.int64)
+        bounds = np.concatenate([[0], np.cumsum(n_sampled)])
+        seg_ids = np.repeat(np.arange(len(segments)), n_sampled)
+        total = int(bounds[-1])
+        
+        # Structure-of-arrays buffer for the basic metrics, one row per
+        # sampled frame and one column per SCORE_COLUMNS entry. The sampling
+        # schedule is fixed by the segment lengths, so the buffer is sized up
+        # front and written by row index. Rows of metrics that skip a sample
+        # stay zero and are excluded through the per-column counts.
+        scores = np.zeros((total, len(SCORE_COLUMNS)), dtype=np.float32)
+        sampled_frames = self._stack_sampled(segments, total, step) if total else []
+        
+        # Native pixels per pixel of the downscaled stack, for the metrics
+        # whose thresholds are in pixels
+        pixel_scale = (
+            next(frames[0] for frames in segments if len(frames)).shape[1]
+            / sampled_frames.shape[2]
+        ) if total else 1.0
+        
+        # Grayscale is shared by most metrics, so convert the stack once
+        gray = convert_stack(sampled_frames, cv2.COLOR_BGR2GRAY) if total else []
+        
+        # Frames that barely differ from the last changed frame reuse its
+        # expensive scores - static shots cost little more than one frame.
+        # Detection restarts per segment, so the first row of each is changed.
+        changed = np.concatenate([
+            self._detect_changes(gray[lo:hi])
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ])
+        
+        # Edge maps are shared by composition (changed frames) and shot
+        # framing (cinematic samples), so detect them once for both
+        edges = self.metrics_manager.detect_edges(
+            gray, changed | self._cinematic_rows(bounds), pixel_scale
+        ) if total else []
+        
+        if total:
+            cheap_metrics = [name for name in BATCH_METRICS if name not in ADAPTIVE_METRICS]
+            batch_scores = self.metrics_manager.calculate_batch(
+                sampled_frames, cheap_metrics, gray=gray
+            )
+            
+            # Calculate adaptive metrics on changed frames only, then spread
+            # each result over the run of unchanged frames that follows it
+            computed = np.flatnonzero(changed)
+            source = np.searchsorted(computed, np.arange(total), side='right') - 1
+            adaptive_scores = self.metrics_manager.calculate_batch(
+                sampled_frames[computed], ADAPTIVE_METRICS,
+                gray=gray[computed], edges=edges[computed], pixel_scale=pixel_scale
+            )
+            for name, values in adaptive_scores.items():
+                batch_scores[name] = values[source]
+            
+            for column, name in enumerate(BATCH_METRICS):
+                scores[:, column] = batch_scores[name]
+            
+            self._detect_people(sampled_frames, gray, scores, changed, bounds)
+            
+            # Motion compares each sampled frame with the one before it in
+            # its segment; all pairs of the batch run on the worker threads
+            motion_rows = np.ones(total, dtype=bool)
+            motion_rows[bounds[:-1][n_sampled > 0]] = False
+            motion_rows = np.flatnonzero(motion_rows)
+            scores[motion_rows, MOTION_COL] = self.metrics_manager.calculate_motion_batch(
+                sampled_frames, gray, motion_rows, pixel_scale
+            )
+        
+        # Cinematic metrics need frame pairs and run segment by segment
+        results = [
+            self._process_sequential(sampled_frames[lo:hi], gray[lo:hi], edges[lo:hi],
+                                     pixel_scale)
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+        
+        # Aggregate basic scores: one scatter-add of every row into its
+        # segment, divided by how many samples each column actually received
+        counts = np.repeat(n_sampled[:, None], len(SCORE_COLUMNS), axis=1)
+        counts[:, MOTION_COL] = np.maximum(n_sampled - 1, 0)
+        counts[:, PERSON_COL:PERSON_COL + 2] = ((n_sampled + 1) // 2)[:, None]
+        
+        sums = np.zeros(counts.shape)
+        np.add.at(sums, seg_ids, scores)
+        
+        means = np.tile(SCORE_DEFAULTS, (len(segments), 1))
+        np.divide(sums, counts, out=means, where=counts > 0)
+        
+        for metrics, row in zip(results, means.tolist()):
+            for name, value in zip(SCORE_COLUMNS, row):
+                setattr(metrics, name, value)
+        
+        return results
+    
+    def _cinematic_rows(self, bounds: np.ndarray) -> np.ndarray:
+        """
+        Rows of the sampled stack that _process_sequential runs the
+        cinematic metrics on: every 2nd row of a segment after its first.
+        
+        Args:
+            bounds: Start row of each segment, followed by the total
+            
+        Returns:
+            Boolean mask over all sampled rows
+        """
+        rows = np.zeros(int(bounds[-1]), dtype=bool)
+        if self.use_cinematic:
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                rows[lo + 2:hi:2] = True
+        return rows
+    
+    def _process_sequential(self, sampled_frames: np.ndarray, grays: np.ndarray,
+                            edges: np.ndarray, pixel_scale: float = 1.0) -> ScoreMetrics:
+        """
+        Run and aggregate the cinematic metrics of one segment.
+        
+        Args:
+            sampled_frames: Sampled frames of the segment
+            grays: Grayscale versions of the sampled frames
+            edges: Edge maps of the sampled frames (filled for the
+                cinematic rows)
+            pixel_scale: Native-resolution pixels per pixel of the
+                sampled frames (default: 1.0)
+            
+        Returns:
+            ScoreMetrics with the cinematic metrics filled in
+        """
         metrics = ScoreMetrics()
         
-        # Storage for individual frame scores - Basic metrics
-        sharpness_scores = []
-        brightness_scores = []
-        contrast_scores = []
-        color_scores = []
-        motion_scores = []
-        composition_scores = []
-        person_scores = []
-        center_focus_scores = []
-        
-        # Storage for cinematic metrics
-        camera_movements = []
-        stabilization_data = []
-        focus_data = []
-        lighting_data = []
-        color_grading_data = []
-        exposure_data = []
-        framing_data = []
+        # Cinematic metrics run on every 2nd sampled frame after the first
+        # (every 6th frame). The schedule is fixed, so each metric's
+        # per-sample records are preallocated and written by row.
+        n_cinematic = len(range(2, len(sampled_frames), 2)) if self.use_cinematic else 0
+        camera_movements = np.empty(n_cinematic, CAMERA_MOVEMENT_DTYPE)
+        stabilization_data = np.empty(n_cinematic, STABILIZATION_DTYPE)
+        focus_data = np.empty(n_cinematic, FOCUS_DTYPE)
+        lighting_data = np.empty(n_cinematic, LIGHTING_DTYPE)
+        color_grading_data = np.empty(n_cinematic, COLOR_GRADING_DTYPE)
+        exposure_data = np.empty(n_cinematic, EXPOSURE_DTYPE)
+        framing_data = np.empty(n_cinematic, FRAMING_DTYPE)
         
         prev_frame = None
+        prev_gray = None
+        frame_views = None
         
-        for i, frame in enumerate(frames):
-            # Sample every 3rd frame for basic metrics (performance optimization)
-            if i % 3 == 0:
-                # Basic metrics
-                sharpness_scores.append(
-                    self.metrics_manager.calculate_sharpness(frame)
-                )
-                brightness_scores.append(
-                    self.metrics_manager.calculate_brightness(frame)
-                )
-                contrast_scores.append(
-                    self.metrics_manager.calculate_contrast(frame)
-                )
-                color_scores.append(
-                    self.metrics_manager.calculate_color_vibrancy(frame)
-                )
-                composition_scores.append(
-                    self.metrics_manager.calculate_composition(frame)
-                )
-                
-                # Person detection every 6th frame (more expensive operation)
-                if i % 6 == 0:
-                    person_score, center_score = \
-                        self.metrics_manager.calculate_person_detection(frame)
-                    person_scores.append(person_score)
-                    center_focus_scores.append(center_score)
-                
-                # Motion requires previous frame
-                if prev_frame is not None:
-                    motion_scores.append(
-                        self.metrics_manager.calculate_motion(frame, prev_frame)
-                    )
+        for k, frame in enumerate(sampled_frames):
+            gray = grays[k]
+            
+            # Cinematic metrics every 6th frame (more expensive)
+            if self.use_cinematic and k % 2 == 0 and prev_frame is not None:
+                row = k // 2 - 1
                 
-                # Cinematic metrics every 6th frame (more expensive)
-                if i % 6 == 0 and prev_frame is not None:
-                    # Camera movement analysis
-                    cam_movement = self.metrics_manager.calculate_camera_movement(
-                        frame, prev_frame
-                    )
-                    camera_movements.append(cam_movement)
-                    
-                    # Stabilization quality
-                    stabilization = self.metrics_manager.calculate_stabilization(
-                        frame, prev_frame
-                    )
-                    stabilization_data.append(stabilization)
-                    
-                    # Focus change detection
-                    focus = self.metrics_manager.calculate_focus_change(
-                        frame, prev_frame
-                    )
-                    focus_data.append(focus)
-                    
-                    # Lighting type
-                    lighting = self.metrics_manager.calculate_lighting_type(frame)
-                    lighting_data.append(lighting)
-                    
-                    # Color grading
-                    grading = self.metrics_manager.calculate_color_grading(frame)
-                    color_grading_data.append(grading)
-                    
-                    # Exposure quality
-                    exposure = self.metrics_manager.calculate_exposure(frame)
-                    exposure_data.append(exposure)
-                    
-                    # Shot framing
-                    framing = self.metrics_manager.calculate_shot_framing(frame)
-                    framing_data.append(framing)
+                # Convert the frame once for all cinematic metrics, and
+                # share the lightness statistics of exposure and lighting
+                # (into the arrays of the previous sample - its metrics are done)
+                frame_views = FrameViews.from_frame(frame, gray=gray, reuse=frame_views)
+                views = frame_views.as_kwargs()
+                views['l_stats'] = LuminanceStats.from_channel(frame_views.lab[:, :, 0])
+                views['edges'] = edges[k]
+                views['pixel_scale'] = pixel_scale
                 
-                prev_frame = frame.copy()
-        
-        # Aggregate basic scores by averaging
-        metrics.sharpness = np.mean(sharpness_scores) if sharpness_scores else 0.0
-        metrics.brightness = np.mean(brightness_scores) if brightness_scores else 0.0
-        metrics.contrast = np.mean(contrast_scores) if contrast_scores else 0.0
-        metrics.color_vibrancy = np.mean(color_scores) if color_scores else 0.0
-        metrics.motion_score = np.mean(motion_scores) if motion_scores else 0.0
-        metrics.composition_score = np.mean(composition_scores) if composition_scores else 0.0
-        metrics.person_score = np.mean(person_scores) if person_scores else 0.5
-        metrics.center_focus_score = np.mean(center_focus_scores) if center_focus_scores else 0.5
+                # All cinematic metrics of this frame, run concurrently
+                analyze_camera = row % self.camera_movement_stride == 0
+                cinematic = self.metrics_manager.calculate_cinematic_for_frame(
+                    frame, prev_frame, camera_movement=analyze_camera,
+                    prev_gray=prev_gray, **views
+                )
+                if analyze_camera:
+                    _store(camera_movements, row, cinematic['camera_movement'])
+                else:
+                    camera_movements[row] = camera_movements[row - 1]
+                _store(stabilization_data, row, cinematic['stabilization'])
+                _store(focus_data, row, cinematic['focus_change'])
+                _store(lighting_data, row, cinematic['lighting_type'])
+                _store(color_grading_data, row, cinematic['color_grading'])
+                _store(exposure_data, row, cinematic['exposure'])
+                _store(framing_data, row, cinematic['shot_framing'])
+            
+            # Metrics never write into their input frames, so keeping a
+            # reference is enough - no need to copy the whole frame
+            prev_frame = frame
+            prev_gray = gray
         
         # Aggregate cinematic metrics
         self._aggregate_camera_movement(metrics, camera_movements)
@@ -157,80 +394,208 @@ class SegmentProcessor:
         
         return metrics
     
-    def _aggregate_camera_movement(self, metrics: ScoreMetrics, data: list):
-        """Aggregate camera movement metrics"""
-        if not data:
+    def _detect_people(self, sampled_frames: np.ndarray, grays: np.ndarray,
+                       scores: np.ndarray, changed: np.ndarray, bounds: np.ndarray):
+        """
+        Fill the person columns of the score buffer in one batched call.
+        
+        Person detection runs on every 2nd sampled frame of each segment
+        (every 6th frame). A frame reuses the detection two rows back when
+        neither it nor the frame in between changed, or when its
+        difference hash matches the last detected frame's, so only the
+        remaining frames go through the detector.
+        
+        Args:
+            sampled_frames: Stacked sampled frames of all segments
+            grays: Grayscale versions of the sampled frames
+            scores: Score buffer (written in place)
+            changed: Change flags of the sampled frames
+            bounds: Row offsets of the segments (len = segments + 1)
+        """
+        n_sampled = np.diff(bounds)
+        local = np.arange(len(changed)) - np.repeat(bounds[:-1], n_sampled)
+        prev_changed = np.concatenate([[True], changed[:-1]])
+        
+        even = np.flatnonzero(local % 2 == 0)
+        first = local[even] < 2
+        need = first | changed[even] | prev_changed[even]
+        
+        # Changed frames can still look the same to the detector (noise,
+        # small camera drift); skip those whose 64-bit difference hash is
+        # within a few bits of the last detected frame's
+        if self.change_threshold > 0:
+            last_hash = None
+            for i in np.flatnonzero(need):
+                frame_hash = _dhash(grays[even[i]])
+                if not first[i] and (frame_hash ^ last_hash).bit_count() < DHASH_MAX_DISTANCE:
+                    need[i] = False
+                else:
+                    last_hash = frame_hash
+        
+        detected = self.metrics_manager.calculate_person_detection_batch(
+            sampled_frames[even[need]]
+        )
+        
+        # Every segment's first even row is detected, so carrying the last
+        # detection forward never crosses into another segment
+        source = np.searchsorted(np.flatnonzero(need), np.arange(len(even)), side='right') - 1
+        scores[even, PERSON_COL:PERSON_COL + 2] = detected[source]
+    
+    def _stack_sampled(self, segments: List[List[np.ndarray]], total: int,
+                       step: int) -> np.ndarray:
+        """
+        Downscale every step-th frame of each segment into one preallocated stack.
+        
+        The stack is sized from the sampling schedule and each frame is
+        resized straight into its row, so no per-frame intermediate
+        arrays or list of them are built before stacking.
+        
+        Args:
+            segments: One list of frames per segment (all the same size)
+            total: Number of sampled frames over all segments
+            step: Sampling stride within each segment
+            
+        Returns:
+            Stack of sampled frames, shape (total, h, w, 3)
+        """
+        first = next(frames[0] for frames in segments if len(frames))
+        width, height = self._scaled_size(first)
+        stack = np.empty((total, height, width, 3), dtype=np.uint8)
+        
+        row = 0
+        for frames in segments:
+            for frame in frames[::step]:
+                if (width, height) == (frame.shape[1], frame.shape[0]):
+                    stack[row] = frame
+                else:
+                    cv2.resize(frame, (width, height), dst=stack[row],
+                               interpolation=cv2.INTER_AREA)
+                row += 1
+        
+        return stack
+    
+    def _scaled_size(self, frame: np.ndarray) -> tuple:
+        """
+        Size a frame is downscaled to, so its longer side is at most
+        downscale_long_edge.
+        
+        Every metric kernel is memory-bound, so resizing once up front
+        cuts the work of all of them; the color conversions made later
+        are of the small frame too.
+        
+        Args:
+            frame: Input video frame (BGR format)
+            
+        Returns:
+            (width, height) after downscaling - the frame's own size if
+            it is small enough
+        """
+        height, width = frame.shape[:2]
+        long_edge = max(height, width)
+        if not self.downscale_long_edge or long_edge <= self.downscale_long_edge:
+            return width, height
+        
+        scale = self.downscale_long_edge / long_edge
+        return round(width * scale), round(height * scale)
+    
+    def _detect_changes(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Flag sampled frames whose picture changed since the last flagged frame.
+        
+        Compares strided thumbnails by mean absolute difference against
+        the last changed frame (not just the previous one), so slow drift
+        still triggers a recalculation once it adds up. Thumbnails come
+        from the grayscale stack, a third of the bytes of the BGR one.
+        
+        Args:
+            frames: Stack of sampled grayscale frames, shape (N, H, W)
+            
+        Returns:
+            Boolean array of N flags; the first frame is always changed
+        """
+        changed = np.ones(len(frames), dtype=bool)
+        if len(frames) < 2 or self.change_threshold <= 0:
+            return changed
+        
+        thumbs = frames[:, ::THUMB_STRIDE, ::THUMB_STRIDE].astype(np.int16)
+        anchor = thumbs[0]
+        
+        for k in range(1, len(thumbs)):
+            if np.abs(thumbs[k] - anchor).mean() > self.change_threshold:
+                anchor = thumbs[k]
+            else:
+                changed[k] = False
+        
+        return changed
+    
+    def _aggregate_camera_movement(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate camera movement records (CAMERA_MOVEMENT_DTYPE)"""
+        if not len(data):
             return
         
         # Get most common movement type
-        movement_types = [d['movement_type'] for d in data]
-        metrics.camera_movement_type = max(set(movement_types), key=movement_types.count)
+        metrics.camera_movement_type = CameraMoveType.from_label(_mode(data['movement_type']))
         
         # Average quality metrics
-        metrics.camera_movement_quality = np.mean([d['cinematic_quality'] for d in data]) / 100.0
-        metrics.camera_movement_smoothness = np.mean([d['smoothness'] for d in data]) / 100.0
-        metrics.camera_movement_confidence = np.mean([d['confidence'] for d in data]) / 100.0
+        metrics.camera_movement_quality = float(data['cinematic_quality'].mean()) / 100.0
+        metrics.camera_movement_smoothness = float(data['smoothness'].mean()) / 100.0
+        metrics.camera_movement_confidence = float(data['confidence'].mean()) / 100.0
     
-    def _aggregate_stabilization(self, metrics: ScoreMetrics, data: list):
-        """Aggregate stabilization metrics"""
-        if not data:
+    def _aggregate_stabilization(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate stabilization records (STABILIZATION_DTYPE)"""
+        if not len(data):
             return
         
-        stab_types = [d['stabilization_type'] for d in data]
-        metrics.stabilization_type = max(set(stab_types), key=stab_types.count)
-        metrics.stabilization_score = np.mean([d['stabilization_score'] for d in data])
+        metrics.stabilization_type = StabilizationType.from_label(_mode(data['stabilization_type']))
+        metrics.stabilization_score = float(data['stabilization_score'].mean())
     
-    def _aggregate_focus(self, metrics: ScoreMetrics, data: list):
-        """Aggregate focus change metrics"""
-        if not data:
+    def _aggregate_focus(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate focus change records (FOCUS_DTYPE)"""
+        if not len(data):
             return
         
         # Check if any frame had focus change
-        metrics.focus_has_change = any(d['has_focus_change'] for d in data)
-        metrics.focus_change_amount = np.mean([d['focus_change_amount'] for d in data])
-        metrics.focus_sharpness = np.mean([d['current_sharpness'] for d in data])
-        metrics.focus_has_bokeh = any(d['has_shallow_dof'] for d in data)
+        metrics.focus_has_change = bool(data['has_focus_change'].any())
+        metrics.focus_change_amount = float(data['focus_change_amount'].mean())
+        metrics.focus_sharpness = float(data['current_sharpness'].mean())
+        metrics.focus_has_bokeh = bool(data['has_shallow_dof'].any())
     
-    def _aggregate_lighting(self, metrics: ScoreMetrics, data: list):
-        """Aggregate lighting type metrics"""
-        if not data:
+    def _aggregate_lighting(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate lighting type records (LIGHTING_DTYPE)"""
+        if not len(data):
             return
         
-        lighting_types = [d['dominant_type'] for d in data]
-        metrics.lighting_type = max(set(lighting_types), key=lighting_types.count)
-        metrics.lighting_quality = np.mean([d['quality_score'] for d in data])
-        metrics.lighting_is_dramatic = any(d['is_dramatic'] for d in data)
+        metrics.lighting_type = LightingType.from_label(_mode(data['dominant_type']))
+        metrics.lighting_quality = float(data['quality_score'].mean())
+        metrics.lighting_is_dramatic = bool(data['is_dramatic'].any())
     
-    def _aggregate_color_grading(self, metrics: ScoreMetrics, data: list):
-        """Aggregate color grading metrics"""
-        if not data:
+    def _aggregate_color_grading(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate color grading records (COLOR_GRADING_DTYPE)"""
+        if not len(data):
             return
         
-        grading_styles = [d['dominant_profile'] for d in data]
-        metrics.color_grading_style = max(set(grading_styles), key=grading_styles.count)
-        metrics.color_grading_strength = np.mean([d['grading_strength'] for d in data])
-        metrics.color_saturation = np.mean([d['saturation_level'] for d in data])
-        metrics.color_warmth = np.mean([d['warmth_level'] for d in data])
+        metrics.color_grading_style = ColorGradingStyle.from_label(_mode(data['dominant_profile']))
+        metrics.color_grading_strength = float(data['grading_strength'].mean())
+        metrics.color_saturation = float(data['saturation_level'].mean())
+        metrics.color_warmth = float(data['warmth_level'].mean())
     
-    def _aggregate_exposure(self, metrics: ScoreMetrics, data: list):
-        """Aggregate exposure metrics"""
-        if not data:
+    def _aggregate_exposure(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate exposure records (EXPOSURE_DTYPE)"""
+        if not len(data):
             return
         
-        exposure_classes = [d['exposure_class'] for d in data]
-        metrics.exposure_quality = max(set(exposure_classes), key=exposure_classes.count)
-        metrics.exposure_score = np.mean([d['exposure_quality'] for d in data])
-        metrics.exposure_is_well_exposed = all(d['is_well_exposed'] for d in data)
+        metrics.exposure_quality = ExposureClass.from_label(_mode(data['exposure_class']))
+        metrics.exposure_score = float(data['exposure_quality'].mean())
+        metrics.exposure_is_well_exposed = bool(data['is_well_exposed'].all())
     
-    def _aggregate_framing(self, metrics: ScoreMetrics, data: list):
-        """Aggregate shot framing metrics"""
-        if not data:
+    def _aggregate_framing(self, metrics: ScoreMetrics, data: np.ndarray):
+        """Aggregate shot framing records (FRAMING_DTYPE)"""
+        if not len(data):
             return
         
-        framing_types = [d['shot_size'] for d in data]
-        metrics.shot_framing_type = max(set(framing_types), key=framing_types.count)
-        metrics.shot_composition_score = np.mean([d['composition_score'] for d in data])
-        metrics.shot_follows_rule_of_thirds = any(d['follows_rule_of_thirds'] for d in data)
+        metrics.shot_framing_type = ShotFramingType.from_label(_mode(data['shot_size']))
+        metrics.shot_composition_score = float(data['composition_score'].mean())
+        metrics.shot_follows_rule_of_thirds = bool(data['follows_rule_of_thirds'].any())
     
     def get_sampling_info(self) -> dict:
         """
@@ -241,14 +606,18 @@ class SegmentProcessor:
         """
         return {
             'basic_metrics': {
-                'metrics': ['sharpness', 'brightness', 'contrast', 
-                           'color_vibrancy', 'composition'],
+                'metrics': ['brightness', 'contrast', 'color_vibrancy'],
                 'sampling': 'every 3rd frame',
                 'reason': 'balance between accuracy and performance'
             },
+            'adaptive_metrics': {
+                'metrics': list(ADAPTIVE_METRICS),
+                'sampling': 'every 3rd frame, only when the picture changed',
+                'reason': 'expensive operation, unchanged frames reuse last score'
+            },
             'person_detection': {
                 'metrics': ['person_score', 'center_focus_score'],
-                'sampling': 'every 6th frame',
+                'sampling': 'every 6th frame, only when the picture changed',
                 'reason': 'expensive operation, less temporal variation'
             },
             'motion_detection': {
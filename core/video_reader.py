@@ -3,12 +3,102 @@
 Video Reader Module
 
 Handles all video file operations including reading, seeking, and extracting frames.
+Frames are decoded with PyAV (FFmpeg) when it is installed, otherwise with
+OpenCV's VideoCapture.
 """
 
+import queue
+import threading
+
 import cv2
 import numpy as np
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Callable, Iterator, List, Tuple, Optional
+
+try:
+    import av
+except ImportError:
+    av = None
+
+
+# Frame decoders: 'pyav' (multi-threaded, optional hardware decoding)
+# or 'opencv'. 'auto' picks pyav when it is installed.
+BACKENDS = ('auto', 'pyav', 'opencv')
+
+
+# Segments decoded ahead of the consumer by prefetch()
+PREFETCH_DEPTH = 3
+
+
+def _require_av():
+    """Get the PyAV module, with a clear message when it is not installed"""
+    if av is None:
+        raise ImportError("The pyav decoding backend requires PyAV (pip install av)")
+    return av
+
+
+def prefetch(iterator: Iterator, depth: int = PREFETCH_DEPTH) -> Iterator:
+    """
+    Run an iterator on a background thread, keeping up to depth items ready.
+    
+    Decoding releases the GIL (in OpenCV and FFmpeg), so a reader thread
+    decodes the next segments while the caller computes metrics on the
+    current one. Exceptions raised by the iterator are re-raised in the
+    caller. Closing the returned generator stops the thread and closes
+    the iterator, releasing its decoder.
+    
+    Args:
+        iterator: Iterator to run, e.g. VideoReader.iterate_segments()
+        depth: Items buffered ahead of the caller (bounds memory)
+        
+    Yields:
+        The iterator's items, in order
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        """Queue an item unless the consumer has stopped"""
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        # Items are (True, value); (False, None) ends the stream and
+        # (False, exception) reports an error
+        try:
+            for item in iterator:
+                if not put((True, item)):
+                    return
+            put((False, None))
+        except Exception as e:
+            put((False, e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+    
+    thread = threading.Thread(target=produce, name='prefetch', daemon=True)
+    thread.start()
+    
+    try:
+        while True:
+            ok, value = items.get()
+            if ok:
+                yield value
+            elif value is None:
+                return
+            else:
+                raise value
+    finally:
+        stop.set()
+        thread.join()
 
 
 class VideoReader:
@@ -16,61 +106,91 @@ class VideoReader:
     Handles reading video files and extracting frames.
     
     Provides methods for getting video metadata and reading specific segments.
+    
+    Every returned frame is a fresh array that no later read reuses, so
+    callers can keep references to frames without copying them. Treat
+    frames as read-only once they are passed to the metrics.
     """
     
-    def __init__(self, video_path: Path):
+    def __init__(self, video_path: Path, backend: str = 'auto',
+                 hwaccel: Optional[str] = None):
         """
         Initialize video reader for a specific video file.
         
         Args:
             video_path: Path to video file
+            backend: Frame decoder - 'auto', 'pyav' or 'opencv' (default: auto)
+            hwaccel: FFmpeg hardware decoder device for the pyav backend,
+                e.g. 'cuda', 'videotoolbox' or 'vaapi' (default: software
+                decoding; requires PyAV). Falls back to software decoding
+                when the device is unavailable.
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        if hwaccel and backend == 'opencv':
+            raise ValueError("Hardware decoding requires the pyav backend")
+        if backend == 'auto':
+            backend = 'pyav' if av is not None or hwaccel else 'opencv'
+        if backend == 'pyav':
+            _require_av()
+        
         self.video_path = video_path
+        self.backend = backend
+        self.hwaccel = hwaccel
         self._validate_video()
     
     def _validate_video(self):
-        """Validate that video file exists and can be opened"""
+        """
+        Validate that video file exists and can be opened.
+        
+        Reads the metadata from the same capture, so the file is only
+        opened once for validation and every get_metadata() call.
+        """
         if not self.video_path.exists():
             raise FileNotFoundError(f"Video file not found: {self.video_path}")
         
         # Try to open video
         cap = cv2.VideoCapture(str(self.video_path))
-        if not cap.isOpened():
+        try:
+            if not cap.isOpened():
+                raise ValueError(f"Cannot open video file: {self.video_path}")
+            
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        finally:
             cap.release()
-            raise ValueError(f"Cannot open video file: {self.video_path}")
-        cap.release()
-    
-    def get_metadata(self) -> dict:
-        """
-        Get video metadata (fps, duration, resolution, etc.).
-        
-        Returns:
-            Dictionary with video metadata
-        """
-        cap = cv2.VideoCapture(str(self.video_path))
-        
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        duration = total_frames / fps if fps > 0 else 0
         
-        cap.release()
-        
-        return {
+        self._metadata = {
             'fps': fps,
             'total_frames': total_frames,
             'width': width,
             'height': height,
-            'duration': duration,
+            'duration': total_frames / fps if fps > 0 else 0,
             'filename': self.video_path.name,
             'path': str(self.video_path)
         }
     
+    def get_metadata(self) -> dict:
+        """
+        Get video metadata (fps, duration, resolution, etc.).
+        
+        Read once when the reader is created; each call returns a copy.
+        
+        Returns:
+            Dictionary with video metadata
+        """
+        return dict(self._metadata)
+    
     def read_segment(self, start_frame: int, num_frames: int) -> List[np.ndarray]:
         """
         Read a segment of frames from the video.
         
+        Opens the file and seeks to start_frame on every call, so use it
+        for random access only - iterate_segments() reads a whole video
+        in one sequential pass.
+        
         Args:
             start_frame: Frame number to start from (0-indexed)
             num_frames: Number of frames to read
@@ -78,6 +198,10 @@ class VideoReader:
         Returns:
             List of frames (BGR format)
         """
+        if self.backend == 'pyav':
+            start_time = start_frame / self.get_metadata()['fps']
+            return list(islice(self._decode_pyav(start_time), num_frames))
+        
         cap = cv2.VideoCapture(str(self.video_path))
         cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
         
@@ -120,6 +244,9 @@ class VideoReader:
         Returns:
             Frame (BGR format) or None if failed
         """
+        if self.backend == 'pyav':
+            return next(self._decode_pyav(time_seconds), None)
+        
         cap = cv2.VideoCapture(str(self.video_path))
         
         # Seek to time
@@ -130,12 +257,24 @@ class VideoReader:
         
         return frame if ret else None
     
-    def iterate_segments(self, segment_duration: float) -> Tuple[int, List[np.ndarray]]:
+    def iterate_segments(self, segment_duration: float,
+                         frame_step: int = 1) -> Tuple[int, List[np.ndarray]]:
         """
         Generator that yields segments of the video.
         
+        Decodes the video once from start to end. Seeking to every
+        segment would make compressed formats re-decode from the previous
+        keyframe each time.
+        
+        With frame_step > 1 only every frame_step-th frame of each segment
+        (counting from its first frame) is converted to BGR and kept; the
+        others are decoded and dropped. A segment then holds 1/frame_step
+        of its frames in memory and skipped frames cost no color
+        conversion.
+        
         Args:
             segment_duration: Duration of each segment in seconds
+            frame_step: Keep every frame_step-th frame (default: 1 - all)
             
         Yields:
             Tuple of (start_frame, frames_list)
@@ -145,12 +284,116 @@ class VideoReader:
         total_frames = metadata['total_frames']
         frames_per_segment = int(fps * segment_duration)
         
-        for start_frame in range(0, total_frames - frames_per_segment, frames_per_segment):
-            frames = self.read_segment(start_frame, frames_per_segment)
+        # Segments start below this frame (same boundaries as seeking)
+        end_frame = total_frames - frames_per_segment
+        
+        decoded = self._grab_frames()
+        try:
+            for start_frame in range(0, end_frame, frames_per_segment):
+                frames = []
+                count = 0
+                for retrieve in islice(decoded, frames_per_segment):
+                    if count % frame_step == 0:
+                        frame = retrieve()
+                        
+                        # A frame that fails to decode ends the stream, as
+                        # a failed read does
+                        if frame is None:
+                            break
+                        frames.append(frame)
+                    count += 1
+                
+                # Only yield if we got enough frames
+                if count >= frames_per_segment // 2:
+                    yield start_frame, frames
+                
+                # Stream ended early (frame count in the header was too high)
+                if count < frames_per_segment:
+                    break
+        finally:
+            # Release the decoder even when the caller stops early
+            decoded.close()
+    
+    def _grab_frames(self) -> Iterator[Callable[[], np.ndarray]]:
+        """
+        Decode every frame of the video in order, deferring BGR conversion.
+        
+        Yields one callable per frame that returns the frame (BGR format),
+        or None if it fails to decode. It must be called before advancing
+        to the next frame; frames whose callable is never called skip the
+        color conversion.
+        
+        Yields:
+            Zero-argument callables returning the current frame or None
+        """
+        if self.backend == 'pyav':
+            for frame in self._decode_pyav_raw():
+                yield partial(frame.to_ndarray, format='bgr24')
+            return
+        
+        cap = cv2.VideoCapture(str(self.video_path))
+        
+        def retrieve():
+            ok, frame = cap.retrieve()
+            return frame if ok else None
+        
+        try:
+            while cap.grab():
+                yield retrieve
+        finally:
+            cap.release()
+    
+    def _decode_pyav(self, start_time: float = 0.0) -> Iterator[np.ndarray]:
+        """
+        Decode frames with PyAV, starting at a time.
+        
+        Args:
+            start_time: First frame to yield, in seconds
+            
+        Yields:
+            Frames (BGR format)
+        """
+        for frame in self._decode_pyav_raw(start_time):
+            yield frame.to_ndarray(format='bgr24')
+    
+    def _decode_pyav_raw(self, start_time: float = 0.0) -> Iterator['av.VideoFrame']:
+        """
+        Decode PyAV video frames, starting at a time.
+        
+        Uses FFmpeg's frame/slice threading and, if self.hwaccel is set,
+        the hardware decoder. Seeks by stream timestamp, which is exact,
+        unlike OpenCV's CAP_PROP_POS_MSEC.
+        
+        Args:
+            start_time: First frame to yield, in seconds
+            
+        Yields:
+            Decoded av.VideoFrame objects
+        """
+        hwaccel = None
+        if self.hwaccel:
+            from av.codec.hwaccel import HWAccel
+            hwaccel = HWAccel(device_type=self.hwaccel, allow_software_fallback=True)
+        
+        container = av.open(str(self.video_path), hwaccel=hwaccel)
+        try:
+            stream = container.streams.video[0]
+            stream.thread_type = 'AUTO'
             
-            # Only yield if we got enough frames
-            if len(frames) >= frames_per_segment // 2:
-                yield start_frame, frames
+            # Seeking lands on the keyframe before start_time; frames up to
+            # start_time are decoded and skipped (half a frame of tolerance
+            # absorbs timestamp rounding)
+            skip_before = 0.0
+            if start_time > 0:
+                container.seek(int(start_time / stream.time_base), stream=stream)
+                skip_before = start_time - 0.5 / float(stream.average_rate or 30)
+            
+            for frame in container.decode(stream):
+                if frame.time is not None and frame.time < skip_before:
+                    continue
+                yield frame
+        finally:
+            container.close()
     
     @staticmethod
     def get_supported_formats() -> set:
@@ -189,7 +432,10 @@ class VideoReader:
 # # Read first 30 frames
 # frames = reader.read_segment(0, 30)
 # 
-# # Iterate through all 1-second segments
-# for start_frame, frames in reader.iterate_segments(1.0):
+# # Iterate through all 1-second segments, decoding ahead on a thread
+# for start_frame, frames in prefetch(reader.iterate_segments(1.0)):
 #     print(f"Processing segment starting at frame {start_frame}")
 #     # ... process frames ...
+# 
+# # Decode on the GPU (requires PyAV)
+# gpu_reader = VideoReader(Path("video.mp4"), backend='pyav', hwaccel='cuda')
@@ -6,19 +6,26 @@ Orchestrates all modules to index videos and create searchable database.
 This is the main entry point for Phase 1 (indexing).
 """
 
-import json
 import argparse
+import functools
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Tuple
+
+import cv2
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from core.data_models import ScoreMetrics, VideoSegment, VideoMetadata, IndexMetadata
-from core.video_reader import VideoReader
-from core.segment_processor import SegmentProcessor
+from core.video_reader import VideoReader, prefetch
+from core.segment_processor import SegmentProcessor, FRAME_STEP
+from core.segment_cache import SegmentCache
+from core.fingerprint import video_fingerprint
+from core.index_io import IndexWriter
 
 
 class VideoIndexer:
@@ -28,17 +35,52 @@ class VideoIndexer:
     Indexes all videos in a folder by analyzing segments and storing metrics.
     """
     
-    def __init__(self, segment_duration: float = 1.0):
+    def __init__(self, segment_duration: float = 1.0, cache_path: Optional[Path] = None,
+                 batch_size: int = 8, workers: Optional[int] = None,
+                 hwaccel: Optional[str] = None, person_model: Optional[Path] = None):
         """
         Initialize the video indexer.
         
         Args:
             segment_duration: Duration of each segment in seconds (default: 1.0)
+            cache_path: Optional SQLite file for caching segment metrics
+                between runs (default: no cache)
+            batch_size: Segments processed together in one batched pass
+                (default: 8; frames of a whole batch are held in memory)
+            workers: Videos indexed in parallel, one process each
+                (default: None = os.cpu_count(); 1 = in this process)
+            hwaccel: Hardware decoder device passed to VideoReader, e.g.
+                'cuda' or 'videotoolbox' (requires PyAV; default: software)
+            person_model: ONNX SSD person detector used instead of HOG
+                (requires onnxruntime; default: HOG)
         """
         self.segment_duration = segment_duration
-        self.processor = SegmentProcessor()
+        self.batch_size = batch_size
+        self.cache_path = cache_path
+        self.workers = workers
+        self.hwaccel = hwaccel
+        self.person_model = person_model
+        
+        # Scores from another person detector must not be read back from
+        # the cache, so its fingerprint is part of the cache key
+        self._cache_salt = video_fingerprint(person_model) if person_model else b''
+    
+    # The processor and cache are created on first use: with several
+    # workers the parent process never indexes a video itself, so it
+    # must not hold a MetricsManager, thread pool or database connection
+    # that the forked workers would inherit
+    @functools.cached_property
+    def processor(self) -> SegmentProcessor:
+        """Segment processor of this process"""
+        return SegmentProcessor(person_model=self.person_model)
     
-    def index_video(self, video_path: Path) -> List[VideoSegment]:
+    @functools.cached_property
+    def cache(self) -> Optional[SegmentCache]:
+        """Segment cache connection of this process (None without cache_path)"""
+        return SegmentCache(self.cache_path) if self.cache_path else None
+    
+    def index_video(self, video_path: Path,
+                    fingerprint: Optional[bytes] = None) -> List[VideoSegment]:
         """
         Index a single video file.
         
@@ -47,6 +89,8 @@ class VideoIndexer:
         
         Args:
             video_path: Path to video file
+            fingerprint: Precomputed video_fingerprint() of the file
+                (computed here if needed for the cache)
             
         Returns:
             List of VideoSegment objects with calculated metrics
@@ -54,25 +98,42 @@ class VideoIndexer:
         print(f"  Indexing {video_path.name}")
         
         # Initialize video reader
-        reader = VideoReader(video_path)
+        reader = VideoReader(video_path, hwaccel=self.hwaccel)
         metadata = reader.get_metadata()
         
         print(f"  Duration: {metadata['duration']:.1f}s, FPS: {metadata['fps']:.1f}")
         
         segments = []
         segment_count = 0
+        cache_hits = 0
         
-        # Iterate through all segments in the video
-        for start_frame, frames in reader.iterate_segments(self.segment_duration):
-            # Calculate metrics for this segment
-            metrics = self.processor.process_segment(frames)
-            
+        # (segment, frames) pairs waiting for a batched metrics pass
+        pending = []
+        
+        video_hash = fingerprint
+        if self.cache and video_hash is None:
+            video_hash = video_fingerprint(video_path)
+        if self.cache:
+            video_hash += self._cache_salt
+        
+        # Iterate through all segments in the video; the next segments are
+        # decoded on a background thread while this one is processed. Only
+        # the frames the processor samples are kept, so pending and
+        # prefetched segments hold a third of their frames.
+        segment_iter = reader.iterate_segments(self.segment_duration, frame_step=FRAME_STEP)
+        for start_frame, frames in prefetch(segment_iter):
             # Calculate timing
             fps = metadata['fps']
             start_time = start_frame / fps
             end_time = start_time + self.segment_duration
             
-            # Create segment object
+            # Reuse metrics from a previous run when cached
+            metrics = None
+            if self.cache:
+                metrics = self.cache.get(video_hash, start_time, end_time)
+            
+            # Create segment object (metrics filled in by _process_pending
+            # unless cached)
             segment = VideoSegment(
                 video_file=video_path.name,
                 start_time=start_time,
@@ -81,25 +142,66 @@ class VideoIndexer:
                 metrics=metrics
             )
             
+            if metrics is None:
+                pending.append((segment, frames))
+                if len(pending) >= self.batch_size:
+                    self._process_pending(pending, video_hash)
+            else:
+                cache_hits += 1
+            
             segments.append(segment)
             segment_count += 1
         
+        self._process_pending(pending, video_hash)
+        
+        if self.cache:
+            print(f"  Cache hits: {cache_hits}/{segment_count}")
+        
         print(f"  Indexed {segment_count} segments")
         return segments
     
+    def _process_pending(self, pending: list, video_hash: Optional[bytes]):
+        """
+        Calculate metrics for a batch of segments in one pass.
+        
+        Args:
+            pending: (segment, sampled frames) pairs; emptied once processed
+            video_hash: Video fingerprint for the cache (None if no cache)
+        """
+        if not pending:
+            return
+        
+        results = self.processor.process_many([frames for _, frames in pending], sampled=True)
+        
+        for (segment, _), metrics in zip(pending, results):
+            segment.metrics = metrics
+            if self.cache:
+                self.cache.put(video_hash, segment.start_time, segment.end_time, metrics)
+        
+        # Commit every batch: the first put() opens a write transaction,
+        # and other workers sharing the database wait until it ends
+        if self.cache:
+            self.cache.commit()
+        
+        pending.clear()
+    
     def index_folder(self, input_folder: Path, output_file: Path) -> Dict:
         """
         Index all videos in a folder.
         
         Processes all supported video files in the folder and creates
-        a comprehensive JSON index with all metrics.
+        a comprehensive index with all metrics. Each video's segments are
+        handed to the output writer as soon as the video is done, so
+        .ndjson output never holds more than one video's segments.
         
         Args:
             input_folder: Path to folder containing videos
-            output_file: Path to output JSON file
+            output_file: Path to output index file (format chosen by
+                extension, see core.index_io)
             
         Returns:
-            Dictionary containing the complete index
+            Dictionary containing the complete index ('segments' is
+            omitted for .ndjson output, which streams them to disk)
         """
         # Find all video files
         video_files = VideoReader.find_videos(input_folder)
@@ -111,77 +213,103 @@ class VideoIndexer:
         print(f"\nFound {len(video_files)} videos to index")
         print(f"Segment duration: {self.segment_duration}s\n")
         
-        all_segments = []
         video_metadata = {}
+        writer = IndexWriter(output_file)
         
-        # Process each video
-        for idx, video_file in enumerate(video_files, 1):
-            print(f"[{idx}/{len(video_files)}]")
-            
-            try:
-                # Index this video
-                segments = self.index_video(video_file)
-                all_segments.extend(segments)
-                
-                # Store metadata
-                video_metadata[video_file.name] = VideoMetadata(
-                    segment_count=len(segments),
-                    file_path=str(video_file),
-                    indexed=True
-                ).to_dict()
-                
-                print(f"  ✓ Completed\n")
-                
-            except Exception as e:
-                print(f"  ✗ Error: {e}\n")
+        # Results arrive in file order so the index does not depend on
+        # which worker finished first
+        for video_file, result in self._index_all(video_files):
+            if isinstance(result, Exception):
                 video_metadata[video_file.name] = VideoMetadata(
                     segment_count=0,
                     file_path=str(video_file),
                     indexed=False,
-                    error=str(e)
+                    error=str(result)
                 ).to_dict()
+                continue
+            
+            segments, fingerprint = result
+            writer.add_segments(segments)
+            
+            # Store metadata
+            video_metadata[video_file.name] = VideoMetadata(
+                segment_count=len(segments),
+                file_path=str(video_file),
+                indexed=True,
+                fingerprint=fingerprint
+            ).to_dict()
         
         # Create index metadata
         index_metadata = IndexMetadata(
             created_at=datetime.now().isoformat(),
             segment_duration=self.segment_duration,
-            total_segments=len(all_segments),
+            total_segments=writer.segment_count,
             total_videos=len(video_files),
             indexed_videos=sum(1 for v in video_metadata.values() if v['indexed']),
-            available_metrics=list(ScoreMetrics().__dict__.keys())
+            available_metrics=ScoreMetrics().get_metric_names()
         )
         
-        # Build complete index structure
-        index = {
-            'metadata': index_metadata.to_dict(),
-            'videos': video_metadata,
-            'segments': [seg.to_dict() for seg in all_segments]
-        }
-        
-        # Save to JSON file
-        self._save_index(index, output_file)
+        # Finish the output file
+        print(f"Saving index to {output_file}")
+        index = writer.close(index_metadata.to_dict(), video_metadata)
         
         # Print summary
         self._print_summary(index)
         
         return index
     
-    def _save_index(self, index: Dict, output_file: Path):
+    def _index_all(self, video_files: List[Path]) -> Iterator[Tuple[Path, object]]:
         """
-        Save index to JSON file.
+        Index each video, in parallel worker processes when workers > 1.
         
         Args:
-            index: Index dictionary
-            output_file: Output file path
+            video_files: Videos to index
+            
+        Yields:
+            (video path, result) in file order, where result is the
+            (segments, fingerprint) of the video or the exception raised
+            while indexing it
         """
-        print(f"Saving index to {output_file}")
+        workers = min(self.workers or os.cpu_count() or 1, len(video_files))
         
-        # Create parent directories if needed
-        output_file.parent.mkdir(exist_ok=True, parents=True)
+        if workers == 1:
+            for idx, video_file in enumerate(video_files, 1):
+                print(f"[{idx}/{len(video_files)}]")
+                
+                try:
+                    fingerprint = video_fingerprint(video_file)
+                    segments = self.index_video(video_file, fingerprint)
+                    print(f"  ✓ Completed\n")
+                except Exception as e:
+                    print(f"  ✗ Error: {e}\n")
+                    yield video_file, e
+                    continue
+                
+                yield video_file, (segments, fingerprint)
+            
+            return
         
-        # Write JSON with indentation for readability
-        with open(output_file, 'w') as f:
-            json.dump(index, f, indent=2)
+        print(f"Indexing with {workers} worker processes\n")
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.segment_duration, self.cache_path, self.batch_size,
+                      self.hwaccel, self.person_model)
+        ) as pool:
+            futures = [pool.submit(_index_one, video_file) for video_file in video_files]
+            
+            # Waiting in file order keeps the output deterministic; videos
+            # that finish early wait in their future until their turn
+            for idx, (video_file, future) in enumerate(zip(video_files, futures), 1):
+                try:
+                    result = future.result()
+                    print(f"[{idx}/{len(video_files)}] {video_file.name} ✓ Completed\n")
+                except Exception as e:
+                    result = e
+                    print(f"[{idx}/{len(video_files)}] {video_file.name} ✗ Error: {e}\n")
+                
+                yield video_file, result
     
     def _print_summary(self, index: Dict):
         """
@@ -202,6 +330,49 @@ class VideoIndexer:
         print(f"{'='*60}\n")
 
 
+# Indexer owned by each worker process (see _init_worker)
+_worker_indexer: Optional[VideoIndexer] = None
+
+
+def _init_worker(segment_duration: float, cache_path: Optional[Path], batch_size: int,
+                 hwaccel: Optional[str], person_model: Optional[Path]):
+    """
+    Build one VideoIndexer per worker process, reused for all its videos.
+    
+    Args:
+        segment_duration: Duration of each segment in seconds
+        cache_path: Optional SQLite file for caching segment metrics
+        batch_size: Segments processed together in one batched pass
+        hwaccel: Hardware decoder device, or None for software decoding
+        person_model: ONNX person detector model, or None for HOG
+    """
+    global _worker_indexer
+    
+    # Parallelism comes from the worker processes; stop OpenCV from
+    # also starting a thread per core in each of them
+    cv2.setNumThreads(1)
+    
+    # Building the indexer creates the process-wide MetricsManager and
+    # person detector here, at pool start, rather than on the first segment
+    _worker_indexer = VideoIndexer(segment_duration, cache_path, batch_size,
+                                   workers=1, hwaccel=hwaccel, person_model=person_model)
+    _worker_indexer.processor
+
+
+def _index_one(video_path: Path) -> tuple:
+    """
+    Index one video in a worker process.
+    
+    Args:
+        video_path: Path to video file
+        
+    Returns:
+        (segments, fingerprint) for the video
+    """
+    fingerprint = video_fingerprint(video_path)
+    return _worker_indexer.index_video(video_path, fingerprint), fingerprint
+
+
 def main():
     """Main entry point for the video indexer"""
     
@@ -218,6 +389,24 @@ Examples:
   
   # Index with 2-second segments for faster processing
   %(prog)s input_videos/ video_index.json -d 2.0
+  
+  # Save a compact binary index instead of JSON
+  %(prog)s input_videos/ video_index.msgpack
+  
+  # Stream segments to newline-delimited JSON (low memory for large corpora)
+  %(prog)s input_videos/ video_index.ndjson
+  
+  # Columnar Parquet index, one typed column per metric (requires pyarrow)
+  %(prog)s input_videos/ video_index.parquet
+  
+  # Cache segment metrics so re-indexing unchanged videos is fast
+  %(prog)s input_videos/ video_index.json --cache .cache/segments.db
+  
+  # Index 4 videos at a time (default: one per CPU core)
+  %(prog)s input_videos/ video_index.json --workers 4
+  
+  # Decode on an NVIDIA GPU (requires PyAV)
+  %(prog)s input_videos/ video_index.json --hwaccel cuda
 
 This creates a searchable index that can be queried later without re-processing videos.
 
@@ -235,7 +424,9 @@ Modular Metrics System:
     )
     parser.add_argument(
         "output_file",
-        help="Output JSON file for the index (e.g., video_index.json)"
+        help="Output file for the index: .json, .msgpack for a compact binary "
+             "index, .ndjson to stream segments one per line, or .parquet "
+             "for a columnar index"
     )
     parser.add_argument(
         "-d", "--segment-duration",
@@ -243,6 +434,25 @@ Modular Metrics System:
         default=1.0,
         help="Duration of each indexed segment in seconds (default: 1.0)"
     )
+    parser.add_argument(
+        "--cache",
+        help="SQLite file for caching segment metrics between runs (default: no cache)"
+    )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        help="Videos indexed in parallel, one process each (default: CPU count)"
+    )
+    parser.add_argument(
+        "--hwaccel",
+        help="Hardware video decoder, e.g. cuda, videotoolbox or vaapi "
+             "(requires PyAV; default: software decoding)"
+    )
+    parser.add_argument(
+        "--person-model",
+        help="ONNX SSD person detector (e.g. an int8 SSD-MobileNet) used "
+             "instead of HOG (requires onnxruntime; default: HOG)"
+    )
     
     args = parser.parse_args()
     
@@ -257,6 +467,12 @@ Modular Metrics System:
     if args.segment_duration <= 0:
         parser.error("Segment duration must be positive")
     
+    if args.workers is not None and args.workers < 1:
+        parser.error("Workers must be at least 1")
+    
+    if args.person_model and not Path(args.person_model).is_file():
+        parser.error(f"Person model does not exist: {args.person_model}")
+    
     if args.segment_duration > 10:
         print("Warning: Large segment duration (>10s) may reduce search granularity")
     
@@ -266,7 +482,13 @@ Modular Metrics System:
     print(f"\nVideo Indexer - Modular Metrics System")
     print(f"{'='*60}\n")
     
-    indexer = VideoIndexer(segment_duration=args.segment_duration)
+    indexer = VideoIndexer(
+        segment_duration=args.segment_duration,
+        cache_path=Path(args.cache) if args.cache else None,
+        workers=args.workers,
+        hwaccel=args.hwaccel,
+        person_model=Path(args.person_model) if args.person_model else None
+    )
     indexer.index_folder(input_path, output_path)
 
 
@@ -5,6 +5,7 @@ Individual metric calculation modules.
 Each metric is in its own file for maximum modularity.
 """
 
+from .base_metric import FrameViews, LuminanceStats, convert_stack, detect_edges
 from .sharpness_metric import SharpnessMetric
 from .brightness_metric import BrightnessMetric
 from .contrast_metric import ContrastMetric
@@ -14,6 +15,10 @@ from .composition_metric import CompositionMetric
 from .person_detection_metric import PersonDetectionMetric
 
 __all__ = [
+    'FrameViews',
+    'LuminanceStats',
+    'convert_stack',
+    'detect_edges',
     'SharpnessMetric',
     'BrightnessMetric',
     'ContrastMetric',
@@ -5,9 +5,307 @@ All metrics inherit from this base class.
 Provides a consistent interface for all metric calculations.
 """
 
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+
+import cv2
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Union, Tuple
+from typing import NamedTuple, Optional, Union, Tuple
+
+
+# cvtColor code for each precomputed view a metric can receive as a kwarg.
+# prev_* views are conversions of prev_frame.
+VIEW_CONVERSIONS = {
+    'gray': cv2.COLOR_BGR2GRAY,
+    'hsv': cv2.COLOR_BGR2HSV,
+    'lab': cv2.COLOR_BGR2LAB,
+    'prev_gray': cv2.COLOR_BGR2GRAY,
+}
+
+
+# Per-frame views a metric can receive as a kwarg: the color conversions
+# plus 'edges', the Canny edge map of the gray view
+FRAME_VIEWS = (*VIEW_CONVERSIONS, 'edges')
+
+# Canny thresholds of the shared 'edges' view
+CANNY_LOW = 50
+CANNY_HIGH = 150
+
+
+def cuda_device_count() -> int:
+    """Number of CUDA devices OpenCV can use (0 for builds without CUDA)"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount()
+    except (AttributeError, cv2.error):
+        return 0
+
+
+# OpenCV was built with the CUDA image processing module and sees a device
+HAS_CUDA_CANNY = hasattr(cv2, 'cuda') and hasattr(cv2.cuda, 'createCannyEdgeDetector') \
+    and cuda_device_count() > 0
+
+# GPU Canny detector, created on first use; CUDA algorithms keep internal
+# buffers, so calls are serialized
+_gpu_canny = None
+_gpu_canny_lock = threading.Lock()
+
+# Frames whose conversions the frame cache keeps (most recently used)
+FRAME_CACHE_SIZE = 4
+
+# Pixel values of a 256-bin uint8 histogram
+LEVELS = np.arange(256, dtype=np.float64)
+LEVELS_SQUARED = LEVELS * LEVELS
+
+
+def convert_stack(frames: np.ndarray, code: int) -> np.ndarray:
+    """
+    Convert a stack of frames with one cvtColor call.
+    
+    Args:
+        frames: Stack of frames, shape (N, H, W, 3) (BGR format)
+        code: cv2.COLOR_* conversion code
+        
+    Returns:
+        Converted stack, shape (N, H, W) or (N, H, W, C)
+    """
+    n, h, w = frames.shape[:3]
+    
+    # View the whole stack as one tall image
+    converted = cv2.cvtColor(frames.reshape(n * h, w, 3), code)
+    return converted.reshape(n, h, w, *converted.shape[2:])
+
+
+def detect_edges(gray: np.ndarray, rows: Optional[np.ndarray] = None,
+                 executor=None, use_gpu: Optional[bool] = None,
+                 pixel_scale: float = 1.0) -> np.ndarray:
+    """
+    Canny edge maps (the shared 'edges' view) of a stack of gray frames.
+    
+    Args:
+        gray: Stack of grayscale frames, shape (N, H, W)
+        rows: Boolean mask of the frames to detect; the maps of the
+            others are left empty (default: all frames)
+        executor: Optional concurrent.futures executor. cv2.Canny
+            releases the GIL, so frames can be processed in parallel.
+        use_gpu: Detect with cv2.cuda (default: when OpenCV has CUDA
+            support and a device); frames are then processed in turn
+        pixel_scale: Native-resolution pixels per pixel of the frames
+            (default: 1.0). Downscaling steepens gradients by about this
+            factor, so the thresholds are raised by it to find the edges
+            Canny would find at the native resolution.
+            
+    Returns:
+        Stack of edge maps, shape (N, H, W) uint8
+    """
+    edges = np.zeros_like(gray)
+    indices = range(len(gray)) if rows is None else np.flatnonzero(rows)
+    low, high = CANNY_LOW * pixel_scale, CANNY_HIGH * pixel_scale
+    
+    if HAS_CUDA_CANNY if use_gpu is None else use_gpu:
+        _detect_edges_gpu(gray, indices, edges, low, high)
+        return edges
+    
+    # Canny must run per frame so gradients don't cross frame borders
+    def detect(i):
+        cv2.Canny(gray[i], low, high, edges=edges[i])
+    
+    if executor is not None:
+        list(executor.map(detect, indices))
+    else:
+        for i in indices:
+            detect(i)
+    return edges
+
+
+def _detect_edges_gpu(gray: np.ndarray, indices, edges: np.ndarray,
+                      low: float = CANNY_LOW, high: float = CANNY_HIGH):
+    """
+    Canny edge maps of the given frames on the GPU, written into edges.
+    
+    Args:
+        gray: Stack of grayscale frames, shape (N, H, W)
+        indices: Frames to detect
+        edges: Output stack, shape (N, H, W) uint8
+        low: Lower Canny threshold
+        high: Upper Canny threshold
+    """
+    global _gpu_canny
+    
+    if not HAS_CUDA_CANNY:
+        raise ImportError("GPU edge detection requires OpenCV built with CUDA and a CUDA device")
+    
+    with _gpu_canny_lock:
+        if _gpu_canny is None:
+            _gpu_canny = cv2.cuda.createCannyEdgeDetector(CANNY_LOW, CANNY_HIGH)
+        _gpu_canny.setLowThreshold(low)
+        _gpu_canny.setHighThreshold(high)
+        
+        # One upload and one download per frame; the GpuMat is reused
+        gpu_gray = cv2.cuda_GpuMat()
+        for i in indices:
+            gpu_gray.upload(gray[i])
+            edges[i] = _gpu_canny.detect(gpu_gray).download()
+
+
+class FrameCache:
+    """
+    Conversions of frames that metrics receive without precomputed views.
+    
+    Metrics called directly on the same frame (not through FrameViews or
+    the segment processor) would each convert it again. get_view and
+    get_edges look conversions up here first, so the second metric - or
+    the next call, where this frame is prev_frame - reuses them.
+    
+    Entries are keyed by frame identity: a weak reference confirms the
+    key still names the same array, and the entry is dropped when the
+    frame is freed. Frames are read-only (see BaseMetric), so cached
+    conversions cannot go stale. Only the most recently used frames
+    are kept.
+    """
+    
+    def __init__(self, size: int = FRAME_CACHE_SIZE):
+        """
+        Args:
+            size: Number of frames whose conversions are kept
+        """
+        self.size = size
+        self._entries = OrderedDict()  # id(frame) -> (weakref, {key: array})
+        
+        # Reentrant: a frame freed by the garbage collector while the lock
+        # is held runs the eviction callback on the same thread
+        self._lock = threading.RLock()
+    
+    def get(self, frame: np.ndarray, key, compute) -> np.ndarray:
+        """
+        Get a conversion of a frame, computing and caching it on a miss.
+        
+        Args:
+            frame: Frame the conversion is of
+            key: Hashable conversion key (e.g. a cvtColor code)
+            compute: Callable returning the conversion
+        """
+        frame_id = id(frame)
+        with self._lock:
+            entry = self._entries.get(frame_id)
+            if entry is not None and entry[0]() is frame and key in entry[1]:
+                self._entries.move_to_end(frame_id)
+                return entry[1][key]
+        
+        # Convert outside the lock so other threads are not held up
+        value = compute()
+        
+        with self._lock:
+            entry = self._entries.get(frame_id)
+            if entry is None or entry[0]() is not frame:
+                ref = weakref.ref(frame, functools.partial(self._evict, frame_id))
+                entry = self._entries[frame_id] = (ref, {})
+            self._entries.move_to_end(frame_id)
+            entry[1][key] = value
+            
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+    
+    def _evict(self, frame_id: int, ref: weakref.ref):
+        """Drop the entry of a freed frame (weakref callback)"""
+        with self._lock:
+            entry = self._entries.get(frame_id)
+            if entry is not None and entry[0] is ref:
+                del self._entries[frame_id]
+
+
+# Conversions of frames passed to metrics without views, shared by all metrics
+frame_cache = FrameCache()
+
+
+class FrameViews(NamedTuple):
+    """
+    Color-space conversions of one frame, computed once and shared.
+    
+    Metrics accept the views as kwargs (see BaseMetric.get_view), so a
+    frame passed to several metrics is only converted once per color space.
+    """
+    bgr: np.ndarray
+    gray: np.ndarray
+    hsv: np.ndarray
+    lab: np.ndarray
+    
+    @classmethod
+    def from_frame(cls, frame: np.ndarray, gray: Optional[np.ndarray] = None,
+                   reuse: Optional['FrameViews'] = None) -> 'FrameViews':
+        """
+        Convert a frame to every color space.
+        
+        Args:
+            frame: Input video frame (BGR format)
+            gray: Already converted grayscale frame, if available
+            reuse: Views of an earlier frame that are no longer needed; the
+                conversions are written into its HSV and LAB arrays (as
+                cvtColor dst=) when the frame size matches, instead of
+                allocating new ones
+        """
+        hsv = lab = None
+        if reuse is not None and reuse.hsv.shape == frame.shape:
+            hsv, lab = reuse.hsv, reuse.lab
+        
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cls(
+            bgr=frame,
+            gray=gray,
+            hsv=cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv),
+            lab=cv2.cvtColor(frame, cv2.COLOR_BGR2LAB, dst=lab)
+        )
+    
+    def as_kwargs(self) -> dict:
+        """Views as metric kwargs (gray, hsv, lab)"""
+        return {'gray': self.gray, 'hsv': self.hsv, 'lab': self.lab}
+
+
+class LuminanceStats(NamedTuple):
+    """
+    Statistics of a frame's LAB lightness channel, computed once and shared.
+    
+    Everything is derived from one 256-bin histogram, so metrics that read
+    the same statistics (exposure and lighting) pass over the channel once
+    instead of each running mean, std, min, max and calcHist on it.
+    
+    The histogram stays on the CPU even when a CUDA device is used for
+    optical flow: the LAB image is needed on the host by the color
+    metrics anyway, and uploading the L channel costs more than the
+    calcHist pass it would replace.
+    """
+    hist: np.ndarray
+    mean: float
+    std: float
+    min: int
+    max: int
+    
+    @classmethod
+    def from_channel(cls, l_channel: np.ndarray) -> 'LuminanceStats':
+        """
+        Calculate the statistics of a lightness channel.
+        
+        Args:
+            l_channel: LAB L channel (uint8)
+        """
+        hist = cv2.calcHist([l_channel], [0], None, [256], [0, 256]).ravel().astype(np.float64)
+        total = hist.sum()
+        
+        mean = hist @ LEVELS / total
+        variance = max(hist @ LEVELS_SQUARED / total - mean * mean, 0.0)
+        occupied = np.flatnonzero(hist)
+        
+        return cls(
+            hist=hist,
+            mean=mean,
+            std=np.sqrt(variance),
+            min=int(occupied[0]),
+            max=int(occupied[-1])
+        )
 
 
 class BaseMetric(ABC):
@@ -15,11 +313,18 @@ class BaseMetric(ABC):
     Abstract base class for all metrics.
     
     All metric classes should inherit from this and implement calculate().
+    
+    Input frames and views are read-only: the pipeline passes the same
+    arrays to several metrics and keeps the previous frame by reference
+    instead of copying it, so metrics must not modify them in place.
     """
     
     def __init__(self):
         """Initialize the metric calculator"""
         self.metric_name = self.__class__.__name__.replace('Metric', '').lower()
+        
+        # Per-thread work buffers (see get_scratch)
+        self._scratch = threading.local()
     
     @abstractmethod
     def calculate(self, frame: np.ndarray, **kwargs) -> Union[float, Tuple[float, ...]]:
@@ -28,13 +333,156 @@ class BaseMetric(ABC):
         
         Args:
             frame: Input video frame (BGR format)
-            **kwargs: Additional arguments specific to the metric
+            **kwargs: Additional arguments specific to the metric, and
+                optional precomputed views of the frame (gray, hsv, lab, edges)
             
         Returns:
             Metric score(s) between 0.0 and 1.0
         """
         pass
     
+    def calculate_batch(self, frames: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Calculate the metric for a stack of frames.
+        
+        The default implementation calls calculate() once per frame.
+        Scalar metrics override this with a vectorized version.
+        
+        Args:
+            frames: Stack of video frames, shape (N, H, W, 3) (BGR format)
+            **kwargs: Additional arguments specific to the metric, and
+                optional precomputed view stacks (gray, hsv, lab, edges)
+            
+        Returns:
+            Array of N metric scores between 0.0 and 1.0
+        """
+        # View stacks are split into per-frame views
+        views = {name: kwargs.pop(name) for name in FRAME_VIEWS if name in kwargs}
+        
+        return np.array(
+            [
+                self.calculate(frame, **kwargs, **{name: view[i] for name, view in views.items()})
+                for i, frame in enumerate(frames)
+            ],
+            dtype=np.float32
+        )
+    
+    @staticmethod
+    def get_view(frame: np.ndarray, kwargs: dict, name: str) -> np.ndarray:
+        """
+        Get a color-space view of a frame, reusing a precomputed one.
+        
+        Args:
+            frame: Frame to convert when the view was not passed in
+                (prev_frame for prev_* views)
+            kwargs: The metric's calculate() kwargs
+            name: View name, a key of VIEW_CONVERSIONS
+            
+        Returns:
+            kwargs[name] if given, otherwise the converted frame (cached
+            in frame_cache, keyed by conversion so a frame's 'gray' is
+            reused as its 'prev_gray')
+        """
+        view = kwargs.get(name)
+        if view is None:
+            code = VIEW_CONVERSIONS[name]
+            view = frame_cache.get(frame, code, lambda: cv2.cvtColor(frame, code))
+        return view
+    
+    @staticmethod
+    def get_batch_view(frames: np.ndarray, kwargs: dict, name: str) -> np.ndarray:
+        """
+        Get a color-space view of a frame stack, reusing a precomputed one.
+        
+        Args:
+            frames: Stack of frames, shape (N, H, W, 3) (BGR format)
+            kwargs: The metric's calculate_batch() kwargs
+            name: View name, a key of VIEW_CONVERSIONS
+            
+        Returns:
+            kwargs[name] if given, otherwise the converted stack
+        """
+        view = kwargs.get(name)
+        if view is None:
+            view = convert_stack(frames, VIEW_CONVERSIONS[name])
+        return view
+    
+    @staticmethod
+    def get_edges(frame: np.ndarray, kwargs: dict, low: int = CANNY_LOW,
+                  high: int = CANNY_HIGH) -> np.ndarray:
+        """
+        Get the Canny edge map of a frame, reusing a precomputed one.
+        
+        SegmentProcessor shrinks sampled frames to a 720-pixel long edge
+        before detecting the shared edges (with thresholds scaled to match
+        the native resolution), so in the indexing pipeline Canny never
+        runs on full-resolution frames.
+        
+        Args:
+            frame: Frame to detect edges in when the view was not passed in
+            kwargs: The metric's calculate() kwargs (edges, gray)
+            low: Lower Canny threshold
+            high: Upper Canny threshold
+            
+        Returns:
+            kwargs['edges'] if given and the thresholds are the shared
+            ones, otherwise the edges of the frame's gray view (cached in
+            frame_cache)
+        """
+        edges = kwargs.get('edges')
+        if edges is None or (low, high) != (CANNY_LOW, CANNY_HIGH):
+            gray = BaseMetric.get_view(frame, kwargs, 'gray')
+            edges = frame_cache.get(frame, ('canny', low, high),
+                                    lambda: cv2.Canny(gray, low, high))
+        return edges
+    
+    @staticmethod
+    def get_luminance_stats(frame: np.ndarray, kwargs: dict) -> LuminanceStats:
+        """
+        Get the lightness statistics of a frame, reusing precomputed ones.
+        
+        Args:
+            frame: Frame to analyze when the statistics were not passed in
+            kwargs: The metric's calculate() kwargs (l_stats, lab)
+            
+        Returns:
+            kwargs['l_stats'] if given, otherwise statistics of the frame
+        """
+        stats = kwargs.get('l_stats')
+        if stats is None:
+            lab = BaseMetric.get_view(frame, kwargs, 'lab')
+            stats = LuminanceStats.from_channel(lab[:, :, 0])
+        return stats
+    
+    def get_scratch(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        """
+        Get a reusable work buffer, e.g. as the dst= of an OpenCV kernel.
+        
+        Sampled frames all have the same size, so a buffer is allocated
+        for the first frame and reused for every later one instead of
+        allocating (and page-faulting) a fresh output per call. Buffers
+        are per thread, so metrics run on worker threads stay safe. This
+        and per-size caches such as CameraMovementMetric's radial
+        direction fields are how metrics specialize to the resolution;
+        scalar geometry like thirds lines costs too little to cache.
+        
+        The contents are overwritten by the next call: reduce the buffer
+        before returning, never hand it to the caller.
+        
+        Args:
+            name: Buffer name, unique within the metric
+            shape: Required shape
+            dtype: Required NumPy dtype
+            
+        Returns:
+            Uninitialized array of the given shape and dtype
+        """
+        buffer = getattr(self._scratch, name, None)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            setattr(self._scratch, name, buffer)
+        return buffer
+    
     def get_name(self) -> str:
         """Get the metric name"""
         return self.metric_name
@@ -5,7 +5,6 @@ Measures lighting quality in LAB color space.
 Optimal range is 40-80% brightness.
 """
 
-import cv2
 import numpy as np
 from .base_metric import BaseMetric
 
@@ -36,7 +35,7 @@ class BrightnessMetric(BaseMetric):
             Brightness score (0.0 to 1.0)
         """
         # Convert to LAB color space
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+        lab = self.get_view(frame, kwargs, 'lab')
         
         # Extract L (lightness) channel
         l_channel = lab[:, :, 0]
@@ -45,17 +44,47 @@ class BrightnessMetric(BaseMetric):
         avg_brightness = np.mean(l_channel) / 255.0
         
         # Score based on optimal range
-        if avg_brightness < self.optimal_min:
-            # Too dark - penalize
-            score = avg_brightness / self.optimal_min
-        elif avg_brightness > self.optimal_max:
-            # Too bright - penalize
-            score = (1.0 - avg_brightness) / (1.0 - self.optimal_max)
-        else:
-            # Optimal range
-            score = 1.0
-        
-        return max(0.0, min(1.0, score))
+        return float(self.score(avg_brightness))
+    
+    def calculate_batch(self, frames: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Calculate brightness scores for a stack of frames.
+        
+        Args:
+            frames: Stack of video frames, shape (N, H, W, 3) (BGR format)
+            
+        Returns:
+            Array of brightness scores (0.0 to 1.0), one per frame
+        """
+        lab = self.get_batch_view(frames, kwargs, 'lab')
+        l_channel = lab[..., 0]
+        
+        # Integer sums reduce the strided L channel in place - exact, and
+        # without the float64 conversion or copy of reshape().mean()
+        l_sums = l_channel.sum(axis=(1, 2), dtype=np.uint64)
+        avg_brightness = l_sums / (l_channel[0].size * 255.0)
+        
+        # Same scoring as calculate(), applied to every frame at once
+        return self.score(avg_brightness)
+    
+    def score(self, avg_brightness):
+        """
+        Score average brightness against the optimal range.
+        
+        1.0 inside [optimal_min, optimal_max], falling linearly to 0 at
+        black and at white. Written without branches - the ramp below the
+        range, the ramp above it and 1.0 are combined with minimum - so it
+        scores a scalar or a whole array of averages in one pass.
+        
+        Args:
+            avg_brightness: Average lightness (0.0 to 1.0), scalar or array
+            
+        Returns:
+            Brightness score(s) (0.0 to 1.0)
+        """
+        rising = avg_brightness / self.optimal_min
+        falling = (1.0 - avg_brightness) / (1.0 - self.optimal_max)
+        return np.clip(np.minimum(rising, falling), 0.0, 1.0)
     
     def get_description(self) -> str:
         return "Measures lighting quality, optimal in the 30-80% brightness range"
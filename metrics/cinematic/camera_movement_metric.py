@@ -5,15 +5,47 @@ Detects and classifies camera movements with high accuracy.
 Uses optical flow and feature tracking.
 """
 
+import heapq
+from operator import attrgetter
+
 import cv2
 import numpy as np
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 from enum import Enum
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from metrics.base_metric import BaseMetric
+from ..base_metric import BaseMetric, cuda_device_count
+
+
+# Feature tracking: FAST corner threshold and how many of the strongest
+# corners are tracked for the affine fit
+FAST_THRESHOLD = 20
+MAX_TRACKED_CORNERS = 150
+
+# The affine fit needs more than 15 tracked corners; when FAST finds
+# fewer (soft or low-contrast pictures, where its absolute threshold
+# rejects most corners), the relative Shi-Tomasi threshold is used instead
+MIN_TRACKED_CORNERS = 16
+
+# Radial (zoom) flow is sampled on every n-th flow pixel of each axis
+RADIAL_FLOW_STRIDE = 2
+
+# Movement classification thresholds (flow pixels per frame pair, degrees
+# for rotation)
+MOTION_THRESHOLD = 0.3
+PAN_THRESHOLD = 0.8
+TILT_THRESHOLD = 0.8
+ZOOM_THRESHOLD = 0.15
+ROTATION_THRESHOLD = 0.8
+
+
+# OpenCV was built with the CUDA optical flow module and sees a device
+HAS_CUDA = hasattr(cv2, 'cuda') and hasattr(cv2.cuda, 'FarnebackOpticalFlow_create') \
+    and cuda_device_count() > 0
+
+
+# Dense flow is calculated on frames halved this many times (cv2.pyrDown);
+# the flow statistics are coarse, so full resolution is not needed
+FLOW_PYRAMID_DOWNS = 1
 
 
 class CameraMovement(Enum):
@@ -33,6 +65,14 @@ class CameraMovement(Enum):
     COMPLEX = "Complex Movement"
 
 
+# Integer code of each movement, in CameraMovement order, and its label.
+# The classifier works on the codes so its branches do not go through
+# Enum attribute and .value lookups.
+(_STATIC, _PAN_LEFT, _PAN_RIGHT, _TILT_UP, _TILT_DOWN, _ZOOM_IN, _ZOOM_OUT,
+ _DOLLY_IN, _DOLLY_OUT, _ROTATION_CW, _ROTATION_CCW, _HANDHELD, _COMPLEX) = range(len(CameraMovement))
+_MOVE_VALUES = tuple(movement.value for movement in CameraMovement)
+
+
 class CameraMovementMetric(BaseMetric):
     """
     Detect and classify camera movement with cinematic quality assessment.
@@ -40,8 +80,33 @@ class CameraMovementMetric(BaseMetric):
     Returns dictionary with movement type, confidence, smoothness, and quality.
     """
     
-    def __init__(self):
+    def __init__(self, use_gpu: Optional[bool] = None):
+        """
+        Args:
+            use_gpu: Calculate the dense flow with cv2.cuda (default: when
+                OpenCV has CUDA support and a device)
+        """
         super().__init__()
+        
+        # Corner detector for feature tracking (stateless, shared by threads)
+        self._fast = cv2.FastFeatureDetector_create(threshold=FAST_THRESHOLD)
+        
+        # Radial direction fields by flow size (see _radial_directions)
+        self._radial_cache = {}
+        
+        self.use_gpu = HAS_CUDA if use_gpu is None else use_gpu
+        
+        if self.use_gpu and not HAS_CUDA:
+            raise ImportError("GPU camera movement requires OpenCV built with CUDA and a CUDA device")
+        
+        # Created once; same parameters as the CPU path below
+        self._gpu_farneback = None
+        if self.use_gpu:
+            self._gpu_farneback = cv2.cuda.FarnebackOpticalFlow_create(
+                numLevels=5 - FLOW_PYRAMID_DOWNS, pyrScale=0.5,
+                winSize=(21 >> FLOW_PYRAMID_DOWNS) | 1,
+                numIters=5, polyN=7, polySigma=1.5
+            )
     
     def calculate(self, frame: np.ndarray, prev_frame: np.ndarray = None, **kwargs) -> Dict:
         """
@@ -50,6 +115,8 @@ class CameraMovementMetric(BaseMetric):
         Args:
             frame: Current video frame (BGR format)
             prev_frame: Previous video frame (required for motion analysis)
+            pixel_scale: Native-resolution pixels per pixel of the given
+                frames (default: 1.0), for frames that were downscaled
             
         Returns:
             Dictionary with movement analysis
@@ -57,33 +124,49 @@ class CameraMovementMetric(BaseMetric):
         if prev_frame is None:
             return self._get_static_result()
         
-        h, w = frame.shape[:2]
-        gray1 = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray1 = self.get_view(prev_frame, kwargs, 'prev_gray')
+        gray2 = self.get_view(frame, kwargs, 'gray')
         
-        # Calculate dense optical flow
-        flow = cv2.calcOpticalFlowFarneback(
-            gray1, gray2, None,
-            pyr_scale=0.5, levels=5, winsize=21,
-            iterations=5, poly_n=7, poly_sigma=1.5, flags=0
-        )
+        # Calculate dense optical flow on downsampled frames. Each halving
+        # takes one level off the flow pyramid and halves the window, so
+        # the coarsest level and the window cover the same image area.
+        small1, small2 = gray1, gray2
+        for _ in range(FLOW_PYRAMID_DOWNS):
+            small1 = cv2.pyrDown(small1)
+            small2 = cv2.pyrDown(small2)
+        
+        if self.use_gpu:
+            flow = self._gpu_flow(small1, small2)
+        else:
+            flow = cv2.calcOpticalFlowFarneback(
+                small1, small2, None,
+                pyr_scale=0.5, levels=5 - FLOW_PYRAMID_DOWNS,
+                winsize=(21 >> FLOW_PYRAMID_DOWNS) | 1,
+                iterations=5, poly_n=7, poly_sigma=1.5, flags=0
+            )
+        
+        # Flow in native-resolution pixels, so the thresholds keep their meaning
+        to_native = (1 << FLOW_PYRAMID_DOWNS) * kwargs.get('pixel_scale', 1.0)
+        flow *= to_native
+        h, w = flow.shape[:2]
         
         # Get flow components
         flow_x = flow[..., 0]
         flow_y = flow[..., 1]
-        magnitude, angle = cv2.cartToPolar(flow_x, flow_y)
+        magnitude = cv2.magnitude(flow_x, flow_y, self.get_scratch('magnitude', (h, w), np.float32))
         
-        # Calculate statistics
-        mean_mag = np.mean(magnitude)
-        std_mag = np.std(magnitude)
-        mean_x = np.mean(flow_x)
-        mean_y = np.mean(flow_y)
+        # Calculate statistics (one pass for mean and std)
+        mean_mag, std_mag = (value[0, 0] for value in cv2.meanStdDev(magnitude))
         
-        # Feature tracking for better accuracy
+        # Feature tracking for better accuracy, on the same downsampled
+        # frames (the affine fit is robust to the resolution)
         scale_factor, rotation_angle, translation_x, translation_y = \
-            self._track_features(gray1, gray2)
+            self._track_features(small1, small2)
+        translation_x *= to_native
+        translation_y *= to_native
         
-        # Analyze radial flow for zoom detection
+        # Analyze radial flow for zoom detection (on the flow grid - the
+        # ratio of offsets to distance does not depend on the scale)
         radial_flow = self._calculate_radial_flow(flow_x, flow_y, h, w)
         median_radial = np.median(radial_flow)
         
@@ -95,9 +178,32 @@ class CameraMovementMetric(BaseMetric):
         
         return movement_result
     
+    def _gpu_flow(self, gray1: np.ndarray, gray2: np.ndarray) -> np.ndarray:
+        """
+        Calculate dense Farneback flow on the GPU.
+        
+        Args:
+            gray1: Previous grayscale frame
+            gray2: Current grayscale frame
+            
+        Returns:
+            Flow field, shape (H, W, 2) float32
+        """
+        gpu1 = cv2.cuda_GpuMat()
+        gpu2 = cv2.cuda_GpuMat()
+        gpu1.upload(gray1)
+        gpu2.upload(gray2)
+        
+        return self._gpu_farneback.calc(gpu1, gpu2, None).download()
+    
     def _track_features(self, gray1, gray2):
-        """Track features between frames for accurate motion estimation"""
-        corners1 = cv2.goodFeaturesToTrack(gray1, maxCorners=300, qualityLevel=0.01, minDistance=10)
+        """
+        Track features between frames for accurate motion estimation.
+        
+        Translations are in pixels of the given frames; scale and
+        rotation do not depend on their resolution.
+        """
+        corners1 = self._detect_corners(gray1)
         
         scale_factor = 1.0
         rotation_angle = 0.0
@@ -107,7 +213,7 @@ class CameraMovementMetric(BaseMetric):
         if corners1 is not None and len(corners1) > 15:
             corners2, status, _ = cv2.calcOpticalFlowPyrLK(
                 gray1, gray2, corners1, None,
-                winSize=(21, 21), maxLevel=3
+                winSize=(15, 15), maxLevel=2
             )
             
             if corners2 is not None and status is not None:
@@ -137,43 +243,134 @@ class CameraMovementMetric(BaseMetric):
         
         return scale_factor, rotation_angle, translation_x, translation_y
     
+    def _detect_corners(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Find corners to track with FAST.
+        
+        FAST is several times cheaper than the Shi-Tomasi scan of
+        goodFeaturesToTrack, and the affine fit only needs on the order of
+        a hundred points, so the strongest MAX_TRACKED_CORNERS are kept.
+        FAST's threshold is absolute, so on soft or low-contrast pictures
+        it can find too few corners; goodFeaturesToTrack, whose quality
+        level is relative to the strongest corner, is used for those.
+        
+        Args:
+            gray: Grayscale frame
+            
+        Returns:
+            Corner positions, shape (N, 1, 2) float32, or None if none found
+        """
+        keypoints = self._fast.detect(gray)
+        if len(keypoints) < MIN_TRACKED_CORNERS:
+            return cv2.goodFeaturesToTrack(gray, maxCorners=MAX_TRACKED_CORNERS,
+                                           qualityLevel=0.01, minDistance=10)
+        
+        keypoints = heapq.nlargest(MAX_TRACKED_CORNERS, keypoints, key=attrgetter('response'))
+        return cv2.KeyPoint_convert(keypoints).reshape(-1, 1, 2)
+    
     def _calculate_radial_flow(self, flow_x, flow_y, h, w):
-        """Calculate radial flow from center for zoom detection"""
-        center_y, center_x = h // 2, w // 2
-        y_coords, x_coords = np.mgrid[0:h, 0:w]
-        dx_from_center = x_coords - center_x
-        dy_from_center = y_coords - center_y
-        distance_from_center = np.sqrt(dx_from_center**2 + dy_from_center**2) + 1e-6
+        """
+        Calculate radial flow from center for zoom detection.
+        
+        Only feeds a median compared against one threshold, so it is
+        taken on every RADIAL_FLOW_STRIDE-th pixel of each axis.
+        """
+        ux, uy = self._radial_directions(h, w)
+        rows, cols = self._radial_samples(h, w)
+        flow_x = flow_x[rows, cols]
+        flow_y = flow_y[rows, cols]
         
-        radial_flow = (flow_x * dx_from_center + flow_y * dy_from_center) / distance_from_center
+        # Projection of the flow onto the outward direction, in a reused buffer
+        radial_flow = np.multiply(flow_x, ux, out=self.get_scratch('radial', ux.shape, np.float32))
+        radial_flow += flow_y * uy
         return radial_flow
     
+    @staticmethod
+    def _radial_samples(h: int, w: int) -> Tuple[slice, slice]:
+        """
+        Rows and columns of the flow sampled for radial flow.
+        
+        The samples are placed symmetrically around the center pixel
+        (an even-sized flow loses its last row or column). With more
+        offsets on one side, the median radial flow of a plain pan is
+        pulled off zero, by more the sparser the sampling.
+        """
+        center_y, center_x = h // 2, w // 2
+        reach_y = min(center_y, h - 1 - center_y) // RADIAL_FLOW_STRIDE * RADIAL_FLOW_STRIDE
+        reach_x = min(center_x, w - 1 - center_x) // RADIAL_FLOW_STRIDE * RADIAL_FLOW_STRIDE
+        return (
+            slice(center_y - reach_y, center_y + reach_y + 1, RADIAL_FLOW_STRIDE),
+            slice(center_x - reach_x, center_x + reach_x + 1, RADIAL_FLOW_STRIDE)
+        )
+    
+    def _radial_directions(self, h: int, w: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unit vectors pointing away from the frame center, per sampled pixel.
+        
+        They only depend on the flow size, so they are built once per
+        size and cached.
+        
+        Args:
+            h: Flow height
+            w: Flow width
+            
+        Returns:
+            Tuple of (x components, y components) on the pixels sampled by
+            _calculate_radial_flow, each float32
+        """
+        directions = self._radial_cache.get((h, w))
+        if directions is None:
+            center_y, center_x = h // 2, w // 2
+            rows, cols = self._radial_samples(h, w)
+            y_coords, x_coords = np.mgrid[rows, cols]
+            dx_from_center = x_coords - center_x
+            dy_from_center = y_coords - center_y
+            distance_from_center = np.sqrt(dx_from_center**2 + dy_from_center**2) + 1e-6
+            
+            directions = (
+                (dx_from_center / distance_from_center).astype(np.float32),
+                (dy_from_center / distance_from_center).astype(np.float32)
+            )
+            self._radial_cache[(h, w)] = directions
+        return directions
+    
     def _classify_movement(self, mean_mag, std_mag, translation_x, translation_y,
                           scale_factor, rotation_angle, median_radial):
         """Classify the type of camera movement"""
-        motion_threshold = 0.3
-        pan_threshold = 0.8
-        tilt_threshold = 0.8
-        zoom_threshold = 0.15
-        rotation_threshold = 0.8
+        # The inputs are NumPy scalars; plain floats make the scalar
+        # arithmetic below several times cheaper
+        mean_mag = float(mean_mag)
+        std_mag = float(std_mag)
+        translation_x = float(translation_x)
+        translation_y = float(translation_y)
+        scale_factor = float(scale_factor)
+        rotation_angle = float(rotation_angle)
+        median_radial = float(median_radial)
+        
+        motion_threshold = MOTION_THRESHOLD
+        pan_threshold = PAN_THRESHOLD
+        tilt_threshold = TILT_THRESHOLD
+        zoom_threshold = ZOOM_THRESHOLD
+        rotation_threshold = ROTATION_THRESHOLD
         
         variance_ratio = std_mag / (mean_mag + 1e-6)
-        direction_consistency = max(0, min(1, 1.0 - (std_mag / (mean_mag + 1e-6))))
+        # variance_ratio >= 0, so only the lower bound can apply
+        direction_consistency = max(0.0, 1.0 - variance_ratio)
         
-        movement_type = CameraMovement.STATIC
+        movement_type = _STATIC
         confidence = 0
         cinematic_quality = 50
         smoothness = 100
         
         # Priority 1: Shake/handheld
         if variance_ratio > 1.5 and mean_mag > motion_threshold:
-            movement_type = CameraMovement.HANDHELD
+            movement_type = _HANDHELD
             confidence = min(100, variance_ratio * 30)
             cinematic_quality = 30
         
         # Priority 2: Rotation
         elif abs(rotation_angle) > rotation_threshold:
-            movement_type = CameraMovement.ROTATION_CCW if rotation_angle > 0 else CameraMovement.ROTATION_CW
+            movement_type = _ROTATION_CCW if rotation_angle > 0 else _ROTATION_CW
             confidence = min(100, abs(rotation_angle) / rotation_threshold * 40)
             cinematic_quality = 75
         
@@ -183,35 +380,35 @@ class CameraMovementMetric(BaseMetric):
             is_zoom_in = scale_factor < 1.0 or median_radial < 0
             
             if is_zoom_in:
-                movement_type = CameraMovement.ZOOM_IN if direction_consistency > 0.6 else CameraMovement.DOLLY_IN
+                movement_type = _ZOOM_IN if direction_consistency > 0.6 else _DOLLY_IN
                 cinematic_quality = 85 if direction_consistency > 0.6 else 90
             else:
-                movement_type = CameraMovement.ZOOM_OUT if direction_consistency > 0.6 else CameraMovement.DOLLY_OUT
+                movement_type = _ZOOM_OUT if direction_consistency > 0.6 else _DOLLY_OUT
                 cinematic_quality = 70 if direction_consistency > 0.6 else 80
             
             confidence = min(100, zoom_strength / zoom_threshold * 60)
         
         # Priority 4: Pan
         elif abs(translation_x) > pan_threshold:
-            movement_type = CameraMovement.PAN_RIGHT if translation_x > 0 else CameraMovement.PAN_LEFT
+            movement_type = _PAN_RIGHT if translation_x > 0 else _PAN_LEFT
             confidence = min(100, abs(translation_x) / pan_threshold * 60)
             cinematic_quality = 75
         
         # Priority 5: Tilt
         elif abs(translation_y) > tilt_threshold:
-            movement_type = CameraMovement.TILT_DOWN if translation_y > 0 else CameraMovement.TILT_UP
+            movement_type = _TILT_DOWN if translation_y > 0 else _TILT_UP
             confidence = min(100, abs(translation_y) / tilt_threshold * 60)
             cinematic_quality = 70
         
         # Priority 6: Complex movement
         elif mean_mag > motion_threshold:
-            movement_type = CameraMovement.COMPLEX
+            movement_type = _COMPLEX
             confidence = min(100, mean_mag / motion_threshold * 40)
             cinematic_quality = 65
         
         else:
             # Static
-            movement_type = CameraMovement.STATIC
+            movement_type = _STATIC
             confidence = 100
             cinematic_quality = 50
         
@@ -220,12 +417,12 @@ class CameraMovementMetric(BaseMetric):
             smoothness = max(0, 100 - (variance_ratio * 30))
         
         # Adjust cinematic quality based on smoothness
-        if movement_type not in [CameraMovement.STATIC, CameraMovement.HANDHELD]:
+        if movement_type != _STATIC and movement_type != _HANDHELD:
             smoothness_bonus = (smoothness / 100) * 25
             cinematic_quality = min(100, cinematic_quality + smoothness_bonus)
         
         return {
-            'movement_type': movement_type.value,
+            'movement_type': _MOVE_VALUES[movement_type],
             'confidence': confidence,
             'magnitude': mean_mag,
             'smoothness': smoothness,
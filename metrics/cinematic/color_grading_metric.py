@@ -8,11 +8,8 @@ Identifies warm, cool, teal-orange, vintage, monochrome, etc.
 import cv2
 import numpy as np
 from typing import Dict, List
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from metrics.base_metric import BaseMetric
+from ..base_metric import BaseMetric
 
 
 class ColorGradingMetric(BaseMetric):
@@ -46,22 +43,22 @@ class ColorGradingMetric(BaseMetric):
             Dictionary with color grading profile
         """
         # Convert to multiple color spaces
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+        hsv = self.get_view(frame, kwargs, 'hsv')
+        lab = self.get_view(frame, kwargs, 'lab')
         
-        # Extract channels
-        h, s, v = cv2.split(hsv)
-        l, a, b = cv2.split(lab)
+        # Calculate statistics (one pass per image for all channels,
+        # no per-channel copies)
+        hsv_mean, hsv_std = cv2.meanStdDev(hsv)
+        saturation_mean = hsv_mean[1, 0]
+        saturation_std = hsv_std[1, 0]
+        value_mean = hsv_mean[2, 0]
         
-        # Calculate statistics
-        saturation_mean = np.mean(s)
-        saturation_std = np.std(s)
-        value_mean = np.mean(v)
+        _, a_mean, b_mean, _ = cv2.mean(lab)
+        # b_mean: Blue-Yellow axis (b channel in LAB)
+        # a_mean: Green-Red axis (a channel in LAB)
         
-        # Blue-Yellow axis (b channel in LAB)
-        b_mean = np.mean(b)
-        # Green-Red axis (a channel in LAB)
-        a_mean = np.mean(a)
+        # Value channel for the shadow/highlight masks below
+        v = cv2.extractChannel(hsv, 2)
         
         profiles = []
         confidence_scores = {}
@@ -93,12 +90,13 @@ class ColorGradingMetric(BaseMetric):
         
         # Teal-Orange (Hollywood look)
         # Check for teal (cyan) in shadows and orange in highlights
-        dark_pixels = frame[v < 100]
-        bright_pixels = frame[v > 155]
+        # (masked means - no copies of the selected pixels are gathered)
+        dark_mask = cv2.compare(v, 100, cv2.CMP_LT)
+        bright_mask = cv2.compare(v, 155, cv2.CMP_GT)
         
-        if len(dark_pixels) > 0 and len(bright_pixels) > 0:
-            dark_b_mean = np.mean(dark_pixels[:, 0])  # Blue channel
-            bright_r_mean = np.mean(bright_pixels[:, 2])  # Red channel
+        if cv2.countNonZero(dark_mask) > 0 and cv2.countNonZero(bright_mask) > 0:
+            dark_b_mean = cv2.mean(frame, mask=dark_mask)[0]  # Blue channel
+            bright_r_mean = cv2.mean(frame, mask=bright_mask)[2]  # Red channel
             
             if dark_b_mean > 120 and bright_r_mean > 140:
                 profiles.append('teal_orange')
@@ -5,14 +5,10 @@ Analyzes exposure quality and dynamic range.
 Detects over/under/well exposed footage.
 """
 
-import cv2
 import numpy as np
 from typing import Dict
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from metrics.base_metric import BaseMetric
+from ..base_metric import BaseMetric
 
 
 class ExposureMetric(BaseMetric):
@@ -36,38 +32,36 @@ class ExposureMetric(BaseMetric):
         
         Args:
             frame: Input video frame (BGR format)
+            **kwargs: Optional precomputed lab view or l_stats
+                (LuminanceStats of the L channel)
             
         Returns:
             Dictionary with exposure metrics
         """
-        # Convert to LAB
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-        l_channel = lab[:, :, 0]
-        
-        # Calculate histogram
-        hist = cv2.calcHist([l_channel], [0], None, [256], [0, 256])
-        hist = hist.flatten() / hist.sum()
+        # Lightness histogram and statistics (LAB L channel)
+        stats = self.get_luminance_stats(frame, kwargs)
+        hist = stats.hist / stats.hist.sum()
         
         # Exposure metrics
-        l_mean = np.mean(l_channel)
-        l_std = np.std(l_channel)
-        l_min = np.min(l_channel)
-        l_max = np.max(l_channel)
+        l_mean = stats.mean
+        l_std = stats.std
+        l_min = stats.min
+        l_max = stats.max
         
         # Check for clipped highlights (>250)
-        clipped_highlights_pct = np.sum(l_channel > 250) / l_channel.size * 100
+        clipped_highlights_pct = hist[251:].sum() * 100
         
         # Check for crushed blacks (<5)
-        crushed_blacks_pct = np.sum(l_channel < 5) / l_channel.size * 100
+        crushed_blacks_pct = hist[:5].sum() * 100
         
         # Dynamic range utilization
         dynamic_range = l_max - l_min
         dynamic_range_score = min(dynamic_range / 255 * 100, 100)
         
         # Histogram distribution quality
-        quarters = [np.sum(hist[i*64:(i+1)*64]) for i in range(4)]
-        mean_quarter = np.mean(quarters)
-        distribution_balance = 1.0 - (np.std(quarters) / mean_quarter) \
+        quarters = hist.reshape(4, 64).sum(axis=1)
+        mean_quarter = quarters.mean()
+        distribution_balance = 1.0 - (quarters.std() / mean_quarter) \
                               if mean_quarter > 0 else 0
         distribution_score = distribution_balance * 100
         
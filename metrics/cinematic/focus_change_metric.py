@@ -7,11 +7,8 @@ Detects focus changes (rack focus) and shallow depth of field.
 import cv2
 import numpy as np
 from typing import Dict
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from metrics.base_metric import BaseMetric
+from ..base_metric import BaseMetric
 
 
 class FocusChangeMetric(BaseMetric):
@@ -33,19 +30,26 @@ class FocusChangeMetric(BaseMetric):
         Args:
             frame: Current video frame (BGR format)
             prev_frame: Previous video frame (optional, for change detection)
+            pixel_scale: Native-resolution pixels per pixel of the given
+                frames (default: 1.0), for frames that were downscaled
             
         Returns:
             Dictionary with focus change metrics
         """
         # Convert to grayscale
-        gray2 = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray2 = self.get_view(frame, kwargs, 'gray')
         
-        # Calculate current sharpness
-        laplacian2 = cv2.Laplacian(gray2, cv2.CV_64F)
-        current_sharpness = np.var(laplacian2)
+        # Calculate current sharpness (one Laplacian, also split into
+        # regions), at the native resolution like SharpnessMetric so the
+        # bokeh threshold keeps its meaning
+        to_native = kwargs.get('pixel_scale', 1.0) ** -2
+        laplacian2 = cv2.Laplacian(gray2, cv2.CV_32F,
+                                   dst=self.get_scratch('laplacian', gray2.shape, np.float32))
+        current_sharpness = cv2.meanStdDev(laplacian2)[1][0, 0] ** 2 * to_native
+        region_sharpness = self._region_sharpness(laplacian2) * to_native
         
         # Detect shallow depth of field (bokeh)
-        has_bokeh = self._detect_bokeh(gray2)
+        has_bokeh = self._detect_bokeh(region_sharpness)
         
         # If no previous frame, return current state only
         if prev_frame is None:
@@ -58,9 +62,10 @@ class FocusChangeMetric(BaseMetric):
             }
         
         # Calculate focus change from previous frame
-        gray1 = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-        laplacian1 = cv2.Laplacian(gray1, cv2.CV_64F)
-        prev_sharpness = np.var(laplacian1)
+        gray1 = self.get_view(prev_frame, kwargs, 'prev_gray')
+        laplacian1 = cv2.Laplacian(gray1, cv2.CV_32F,
+                                   dst=self.get_scratch('prev_laplacian', gray1.shape, np.float32))
+        prev_sharpness = cv2.meanStdDev(laplacian1)[1][0, 0] ** 2 * to_native
         
         # Calculate focus change
         focus_change = abs(current_sharpness - prev_sharpness)
@@ -74,48 +79,53 @@ class FocusChangeMetric(BaseMetric):
             'focus_change_amount': focus_change_percentage,
             'current_sharpness': current_sharpness,
             'has_shallow_dof': has_bokeh,
-            'dof_variance': self._calculate_dof_variance(gray2)
+            'dof_variance': self._calculate_dof_variance(region_sharpness)
         }
     
-    def _detect_bokeh(self, gray: np.ndarray) -> bool:
+    def _region_sharpness(self, laplacian: np.ndarray) -> np.ndarray:
         """
-        Detect shallow depth of field (bokeh effect).
+        Laplacian variance of each region of a 3x3 grid.
         
-        High variance in sharpness across regions indicates bokeh.
+        The whole-frame Laplacian is cropped to a multiple of 3 rows and
+        viewed as 3 bands of rows, so the per-column sums of values and
+        squares of every band come from one reduction each; the columns
+        are then summed into the 3 blocks of each band. No per-region
+        Laplacian, list or copy of the crop is made.
+        
+        Args:
+            laplacian: Laplacian of the grayscale frame (float32)
+            
+        Returns:
+            Variance per region, shape (3, 3)
         """
-        h, w = gray.shape
+        rh, rw = laplacian.shape[0] // 3, laplacian.shape[1] // 3
+        bands = laplacian[:rh * 3]
+        squares = np.multiply(bands, bands, out=self.get_scratch('squares', bands.shape, np.float32))
         
-        # Divide into 9 regions (3x3 grid)
-        regions = []
-        for i in range(3):
-            for j in range(3):
-                region = gray[i*h//3:(i+1)*h//3, j*w//3:(j+1)*w//3]
-                laplacian = cv2.Laplacian(region, cv2.CV_64F)
-                sharpness = np.var(laplacian)
-                regions.append(sharpness)
+        def block_means(values):
+            column_sums = values.reshape(3, rh, -1).sum(axis=1, dtype=np.float64)
+            return column_sums[:, :rw * 3].reshape(3, 3, rw).sum(axis=2) / (rh * rw)
         
+        # Laplacian means are near zero, so E[x^2] - E[x]^2 does not cancel
+        means = block_means(bands)
+        return np.maximum(block_means(squares) - means * means, 0.0)
+    
+    def _detect_bokeh(self, region_sharpness: np.ndarray) -> bool:
+        """
+        Detect shallow depth of field (bokeh effect).
+        
+        High variance in sharpness across regions indicates bokeh.
+        """
         # High variance in sharpness = shallow DOF
-        sharpness_variance = np.var(regions)
+        sharpness_variance = np.var(region_sharpness)
         
         # Threshold for bokeh detection
         return sharpness_variance > 1000
     
-    def _calculate_dof_variance(self, gray: np.ndarray) -> float:
+    def _calculate_dof_variance(self, region_sharpness: np.ndarray) -> float:
         """Calculate depth of field variance metric"""
-        h, w = gray.shape
-        
-        regions = [
-            gray[0:h//3, 0:w//3],           # Top-left
-            gray[h//3:2*h//3, w//3:2*w//3], # Center
-            gray[2*h//3:h, 2*w//3:w]        # Bottom-right
-        ]
-        
-        region_sharpness = [
-            np.var(cv2.Laplacian(region, cv2.CV_64F)) 
-            for region in regions
-        ]
-        
-        return float(np.var(region_sharpness))
+        # Top-left, center and bottom-right regions
+        return float(np.var(np.diagonal(region_sharpness)))
     
     def get_description(self) -> str:
         return "Detects focus changes (rack focus) and shallow depth of field"
@@ -8,11 +8,8 @@ Detects golden hour, blue hour, high key, low key, natural, backlit, etc.
 import cv2
 import numpy as np
 from typing import Dict, List
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from metrics.base_metric import BaseMetric
+from ..base_metric import BaseMetric
 
 class LightingTypeMetric(BaseMetric):
     """
@@ -40,25 +37,25 @@ class LightingTypeMetric(BaseMetric):
         
         Args:
             frame: Input video frame (BGR format)
+            **kwargs: Optional precomputed lab view or l_stats
+                (LuminanceStats of the L channel)
             
         Returns:
             Dictionary with lighting classification
         """
         # Convert to LAB color space
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-        l_channel = lab[:, :, 0]
-        b_channel = lab[:, :, 2]  # Blue-Yellow axis
+        lab = self.get_view(frame, kwargs, 'lab')
         
-        # Calculate statistics
-        l_mean = np.mean(l_channel)
-        l_std = np.std(l_channel)
-        l_min = np.min(l_channel)
-        l_max = np.max(l_channel)
-        b_mean = np.mean(b_channel)
+        # Calculate statistics (lightness ones shared with other metrics)
+        stats = self.get_luminance_stats(frame, {**kwargs, 'lab': lab})
+        l_mean = stats.mean
+        l_std = stats.std
+        l_min = stats.min
+        l_max = stats.max
+        b_mean = cv2.mean(lab)[2]  # Blue-Yellow axis
         
-        # Calculate histogram
-        hist = cv2.calcHist([l_channel], [0], None, [256], [0, 256])
-        hist = hist.flatten() / hist.sum()
+        # Lightness histogram
+        hist = stats.hist / stats.hist.sum()
         
         # Detect lighting types
         lighting_types = []
@@ -90,16 +87,16 @@ class LightingTypeMetric(BaseMetric):
             confidence_scores['low_key'] = min((100 - l_mean) / 100 * 100, 100)
         
         # Backlit (high contrast with dark foreground)
-        dark_ratio = np.sum(hist[0:50])
-        bright_ratio = np.sum(hist[200:256])
+        dark_ratio = hist[:50].sum()
+        bright_ratio = hist[200:].sum()
         
         if dark_ratio > 0.3 and bright_ratio > 0.2 and l_std > 50:
             lighting_types.append('backlit')
             confidence_scores['backlit'] = 80
         
         # Three-Point Lighting (even distribution, studio look)
-        quarters = [np.sum(hist[i*64:(i+1)*64]) for i in range(4)]
-        if all(0.15 < q < 0.35 for q in quarters):
+        quarters = hist.reshape(4, 64).sum(axis=1)
+        if np.all((quarters > 0.15) & (quarters < 0.35)):
             lighting_types.append('three_point')
             confidence_scores['three_point'] = 70
         
@@ -8,11 +8,8 @@ Detects tripod, gimbal, handheld stabilized, or handheld unstabilized.
 import cv2
 import numpy as np
 from typing import Dict
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from metrics.base_metric import BaseMetric
+from ..base_metric import BaseMetric
 
 
 class StabilizationMetric(BaseMetric):
@@ -38,6 +35,8 @@ class StabilizationMetric(BaseMetric):
         Args:
             frame: Current video frame (BGR format)
             prev_frame: Previous video frame (required for analysis)
+            pixel_scale: Native-resolution pixels per pixel of the given
+                frames (default: 1.0), for frames that were downscaled
             
         Returns:
             Dictionary with stabilization type and score
@@ -49,10 +48,13 @@ class StabilizationMetric(BaseMetric):
                 'motion_consistency': 0.0
             }
         
-        gray1 = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray1 = self.get_view(prev_frame, kwargs, 'prev_gray')
+        gray2 = self.get_view(frame, kwargs, 'gray')
         
-        # Detect feature points
+        # Detect feature points. They are detected afresh for every pair:
+        # the segment processor scores pairs (k-1, k) for even k, so a
+        # pair's previous frame was never the current frame of the pair
+        # before, and no tracked corners exist for it.
         corners1 = cv2.goodFeaturesToTrack(
             gray1, 
             maxCorners=300, 
@@ -81,26 +83,26 @@ class StabilizationMetric(BaseMetric):
                 'motion_consistency': 0.0
             }
         
-        # Filter good matches
-        good_old = corners1[status == 1]
-        good_new = corners2[status == 1]
-        
-        if len(good_old) < 20:
+        # Good matches are those LK tracked (status 1); used as a mask
+        # below rather than gathered into new arrays
+        if cv2.countNonZero(status) < 20:
             return {
                 'stabilization_type': 'unknown',
                 'stabilization_score': 0.5,
                 'motion_consistency': 0.0
             }
         
-        # Calculate motion vectors
-        motion_vectors = good_new - good_old
+        # Calculate motion vectors, shape (N, 1, 2): an N x 1 two-channel
+        # image, so OpenCV reduces x and y separately
+        motion_vectors = corners2 - corners1
         
-        # Calculate consistency of motion (how similar are all vectors)
-        motion_std = np.std(motion_vectors, axis=0)
-        motion_mean = np.mean(np.abs(motion_vectors), axis=0)
+        # Calculate consistency of motion (how similar are all vectors):
+        # per-axis std of the good matches in one pass
+        _, motion_std = cv2.meanStdDev(motion_vectors, mask=status)
         
-        # Consistency score (low std relative to mean = high consistency)
-        motion_consistency = 1.0 / (1.0 + np.mean(motion_std))
+        # Consistency score (low std relative to mean = high consistency),
+        # from the spread in native-resolution pixels
+        motion_consistency = 1.0 / (1.0 + motion_std.mean() * kwargs.get('pixel_scale', 1.0))
         
         # Normalized score (0-1)
         stabilization_score = motion_consistency
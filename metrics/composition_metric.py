@@ -7,7 +7,7 @@ Good composition has edges distributed across the frame.
 
 import cv2
 import numpy as np
-from .base_metric import BaseMetric
+from .base_metric import BaseMetric, CANNY_LOW, CANNY_HIGH
 
 
 class CompositionMetric(BaseMetric):
@@ -22,8 +22,8 @@ class CompositionMetric(BaseMetric):
     
     def __init__(self):
         super().__init__()
-        self.canny_low = 50
-        self.canny_high = 150
+        self.canny_low = CANNY_LOW
+        self.canny_high = CANNY_HIGH
     
     def calculate(self, frame: np.ndarray, **kwargs) -> float:
         """
@@ -35,38 +35,76 @@ class CompositionMetric(BaseMetric):
         Returns:
             Composition score (0.0 to 1.0)
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Detect edges
-        edges = cv2.Canny(gray, self.canny_low, self.canny_high)
+        # Detect edges (on the grayscale frame)
+        edges = self.get_edges(frame, kwargs, self.canny_low, self.canny_high)
         
         # Divide frame into 9 sections (rule of thirds)
-        h, w = edges.shape
-        sections = []
+        sections = self._section_sums(edges[np.newaxis])
         
-        for i in range(3):
-            for j in range(3):
-                # Extract section
-                section = edges[
-                    i * h // 3 : (i + 1) * h // 3,
-                    j * w // 3 : (j + 1) * w // 3
-                ]
-                # Count edges in section
-                sections.append(np.sum(section))
+        return float(self._score_sections(sections)[0])
+    
+    def calculate_batch(self, frames: np.ndarray, executor=None, **kwargs) -> np.ndarray:
+        """
+        Calculate composition scores for a stack of frames.
         
-        # Calculate distribution
-        # Good composition has relatively even edge distribution
-        if np.mean(sections) == 0:
-            return 0.0
+        Args:
+            frames: Stack of video frames, shape (N, H, W, 3) (BGR format)
+            executor: Optional concurrent.futures executor. cv2.Canny
+                releases the GIL, so frames can be processed in parallel.
+            **kwargs: Optional precomputed view stacks (gray, edges)
+            
+        Returns:
+            Array of composition scores (0.0 to 1.0), one per frame
+        """
+        edges = kwargs.get('edges')
+        if edges is None or (self.canny_low, self.canny_high) != (CANNY_LOW, CANNY_HIGH):
+            gray = self.get_batch_view(frames, kwargs, 'gray')
+            
+            # Canny must run per frame so gradients don't cross frame borders
+            def detect(g):
+                return cv2.Canny(g, self.canny_low, self.canny_high)
+            
+            if executor is not None:
+                edges = np.stack(list(executor.map(detect, gray)))
+            else:
+                edges = np.stack([detect(g) for g in gray])
         
-        edge_distribution = np.std(sections) / (np.mean(sections) + 1)
+        return self._score_sections(self._section_sums(edges))
+    
+    def _section_sums(self, edges: np.ndarray) -> np.ndarray:
+        """
+        Sum edge pixels in each rule-of-thirds section.
+        
+        Args:
+            edges: Stack of edge maps, shape (N, H, W)
+            
+        Returns:
+            Array of shape (N, 9), sections in row-major order
+        """
+        h, w = edges.shape[1:]
+        
+        # Column sums of each horizontal band (contiguous reductions), then
+        # one reduceat splits the columns into thirds. int32 holds the
+        # sections of frames up to ~75 megapixels.
+        bands = np.stack([
+            edges[:, i * h // 3 : (i + 1) * h // 3].sum(axis=1, dtype=np.int32)
+            for i in range(3)
+        ], axis=1)
+        
+        return np.add.reduceat(bands, [0, w // 3, 2 * w // 3], axis=2).reshape(len(edges), 9)
+    
+    def _score_sections(self, sections: np.ndarray) -> np.ndarray:
+        """Composition score of each row of section edge sums"""
+        # Good composition has relatively even edge distribution
+        mean = sections.mean(axis=1)
+        edge_distribution = sections.std(axis=1) / (mean + 1)
         
         # Lower std relative to mean = better distribution
         # Normalize and invert (lower is better)
-        score = 1.0 - min(edge_distribution / 2.0, 1.0)
+        score = 1.0 - np.minimum(edge_distribution / 2.0, 1.0)
         
-        return max(0.0, score)
+        # Frames without edges score 0
+        return np.where(mean == 0, 0.0, np.maximum(score, 0.0))
     
     def get_description(self) -> str:
         return "Measures composition quality using edge distribution across rule of thirds grid"
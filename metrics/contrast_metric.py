@@ -35,10 +35,10 @@ class ContrastMetric(BaseMetric):
             Contrast score (0.0 to 1.0)
         """
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = self.get_view(frame, kwargs, 'gray')
         
         # Calculate standard deviation (measure of contrast)
-        std_dev = np.std(gray)
+        std_dev = self._std(gray)
         
         # Normalize to 0-1 range
         # Typical values range from 0-80, we use 60 as good contrast
@@ -46,5 +46,34 @@ class ContrastMetric(BaseMetric):
         
         return score
     
+    def calculate_batch(self, frames: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Calculate contrast scores for a stack of frames.
+        
+        Args:
+            frames: Stack of video frames, shape (N, H, W, 3) (BGR format)
+            
+        Returns:
+            Array of contrast scores (0.0 to 1.0), one per frame
+        """
+        gray = self.get_batch_view(frames, kwargs, 'gray')
+        std_dev = np.array([self._std(g) for g in gray])
+        
+        return np.minimum(std_dev / self.typical_max, 1.0)
+    
+    def _std(self, gray: np.ndarray) -> float:
+        """
+        Standard deviation of a grayscale image.
+        
+        meanStdDev accumulates the sum and sum of squares in one SIMD
+        pass. Both are exact in double precision for uint8 input, so
+        there is no cancellation, and no float64 copy of the frame is
+        made as ndarray.std() does. Integral images (cv2.integral2) cost
+        about ten times this pass and only pay off for many region
+        queries, which no metric makes.
+        """
+        _, stddev = cv2.meanStdDev(gray)
+        return float(stddev[0, 0])
+    
     def get_description(self) -> str:
         return "Measures image contrast and visual definition using standard deviation"
@@ -5,9 +5,22 @@ Measures motion between frames using optical flow.
 Moderate motion is ideal - not static, not chaotic.
 """
 
+import threading
+
 import cv2
 import numpy as np
-from .base_metric import BaseMetric
+from typing import Optional
+
+from .base_metric import BaseMetric, cuda_device_count
+
+
+# Flow is calculated on frames halved this many times (cv2.pyrDown); only
+# its mean magnitude is used, which downsampling changes only in scale
+FLOW_PYRAMID_DOWNS = 1
+
+# OpenCV was built with the CUDA optical flow module and sees a device
+HAS_CUDA = hasattr(cv2, 'cuda') and hasattr(cv2.cuda, 'FarnebackOpticalFlow_create') \
+    and cuda_device_count() > 0
 
 
 class MotionMetric(BaseMetric):
@@ -20,10 +33,32 @@ class MotionMetric(BaseMetric):
     Range: 0.0 (no motion) to 1.0 (optimal motion)
     """
     
-    def __init__(self):
+    def __init__(self, use_gpu: Optional[bool] = None):
+        """
+        Args:
+            use_gpu: Calculate the flow with cv2.cuda (default: when OpenCV
+                has CUDA support and a device)
+        """
         super().__init__()
         self.low_motion_threshold = 3.0   # Below this is too static
         self.high_motion_threshold = 20.0  # Above this is too chaotic
+        
+        self.use_gpu = HAS_CUDA if use_gpu is None else use_gpu
+        
+        if self.use_gpu and not HAS_CUDA:
+            raise ImportError("GPU motion requires OpenCV built with CUDA and a CUDA device")
+        
+        # Created once; same parameters as the CPU path. Frame pairs arrive
+        # from several threads and the algorithm keeps internal buffers,
+        # so GPU calls are serialized.
+        self._gpu_farneback = None
+        self._gpu_lock = threading.Lock()
+        if self.use_gpu:
+            self._gpu_farneback = cv2.cuda.FarnebackOpticalFlow_create(
+                numLevels=3 - FLOW_PYRAMID_DOWNS, pyrScale=0.5,
+                winSize=(15 >> FLOW_PYRAMID_DOWNS) | 1,
+                numIters=3, polyN=5, polySigma=1.2
+            )
     
     def calculate(self, frame: np.ndarray, prev_frame: np.ndarray = None, **kwargs) -> float:
         """
@@ -32,6 +67,8 @@ class MotionMetric(BaseMetric):
         Args:
             frame: Current video frame (BGR format)
             prev_frame: Previous video frame (BGR format), required!
+            pixel_scale: Native-resolution pixels per pixel of the given
+                frames (default: 1.0), for frames that were downscaled
             
         Returns:
             Motion score (0.0 to 1.0)
@@ -41,39 +78,79 @@ class MotionMetric(BaseMetric):
             return 0.0
         
         # Convert both frames to grayscale
-        prev_gray = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-        curr_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        prev_gray = self.get_view(prev_frame, kwargs, 'prev_gray')
+        curr_gray = self.get_view(frame, kwargs, 'gray')
         
-        # Calculate dense optical flow
-        flow = cv2.calcOpticalFlowFarneback(
-            prev_gray, curr_gray, None,
-            pyr_scale=0.5,
-            levels=3,
-            winsize=15,
-            iterations=3,
-            poly_n=5,
-            poly_sigma=1.2,
-            flags=0
-        )
+        # Downsample both frames; each halving takes one level off the flow
+        # pyramid and halves the window, keeping the area they cover
+        for _ in range(FLOW_PYRAMID_DOWNS):
+            prev_gray = cv2.pyrDown(prev_gray)
+            curr_gray = cv2.pyrDown(curr_gray)
         
-        # Calculate magnitude of motion vectors
-        magnitude = np.sqrt(flow[..., 0]**2 + flow[..., 1]**2)
-        avg_motion = np.mean(magnitude)
+        # Calculate dense optical flow into a reused (H, W, 2) buffer
+        if self.use_gpu:
+            flow = self._gpu_flow(prev_gray, curr_gray)
+        else:
+            flow = cv2.calcOpticalFlowFarneback(
+                prev_gray, curr_gray,
+                self.get_scratch('flow', curr_gray.shape + (2,), np.float32),
+                pyr_scale=0.5,
+                levels=3 - FLOW_PYRAMID_DOWNS,
+                winsize=(15 >> FLOW_PYRAMID_DOWNS) | 1,
+                iterations=3,
+                poly_n=5,
+                poly_sigma=1.2,
+                flags=0
+            )
+        
+        # Calculate magnitude of motion vectors (one fused pass, no
+        # squared temporaries) and its mean, in native-resolution pixels so
+        # the thresholds keep their meaning
+        magnitude = cv2.magnitude(flow[..., 0], flow[..., 1],
+                                  self.get_scratch('magnitude', curr_gray.shape, np.float32))
+        avg_motion = cv2.mean(magnitude)[0] * (1 << FLOW_PYRAMID_DOWNS) \
+            * kwargs.get('pixel_scale', 1.0)
         
         # Score based on optimal motion range
-        if avg_motion < self.low_motion_threshold:
-            # Too static
-            score = (avg_motion / self.low_motion_threshold) * 0.5
-        elif avg_motion > self.high_motion_threshold:
-            # Too chaotic
-            score = max(0.0, 1.0 - (avg_motion - self.high_motion_threshold) / 30.0)
-        else:
-            # Optimal motion range
-            motion_range = self.high_motion_threshold - self.low_motion_threshold
-            normalized = (avg_motion - self.low_motion_threshold) / motion_range
-            score = 0.5 + (normalized * 0.5)
+        return float(self.score(avg_motion))
+    
+    def score(self, avg_motion):
+        """
+        Score average motion against the optimal range.
+        
+        Rises linearly from 0 (static) to 0.5 at low_motion_threshold and
+        to 1.0 at high_motion_threshold, then falls to 0 over the next 30
+        pixels (chaotic). The ramps are one clamped linear interpolation
+        rather than branches, so it scores a scalar or a whole array of
+        averages in one pass.
+        
+        Args:
+            avg_motion: Mean flow magnitude in pixels, scalar or array
+            
+        Returns:
+            Motion score(s) (0.0 to 1.0)
+        """
+        low, high = self.low_motion_threshold, self.high_motion_threshold
+        return np.interp(avg_motion, (0.0, low, high, high + 30.0), (0.0, 0.5, 1.0, 0.0))
+    
+    def _gpu_flow(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> np.ndarray:
+        """
+        Calculate dense Farneback flow on the GPU.
         
-        return max(0.0, min(1.0, score))
+        Args:
+            prev_gray: Previous grayscale frame
+            curr_gray: Current grayscale frame
+            
+        Returns:
+            Flow field, shape (H, W, 2) float32
+        """
+        with self._gpu_lock:
+            gpu_prev = cv2.cuda_GpuMat()
+            gpu_curr = cv2.cuda_GpuMat()
+            gpu_prev.upload(prev_gray)
+            gpu_curr.upload(curr_gray)
+            
+            return self._gpu_farneback.calc(gpu_prev, gpu_curr, None).download()
     
     def get_description(self) -> str:
         return "Measures motion between frames using optical flow, optimal at moderate levels"
@@ -2,18 +2,71 @@
 Person Detection Metric
 
 Detects people in frames and calculates coverage + centering scores.
-Uses HOG (Histogram of Oriented Gradients) + SVM detector.
+Uses HOG (Histogram of Oriented Gradients) + SVM detector, or an SSD
+detector run with ONNX Runtime when a model is given.
 """
 
+import functools
+import math
+
 import cv2
 import numpy as np
-from typing import Tuple
-from .base_metric import BaseMetric
+from typing import Optional, Tuple
+from .base_metric import BaseMetric, convert_stack
+
+try:
+    import onnxruntime
+    HAS_ONNXRUNTIME = True
+except ImportError:
+    onnxruntime = None
+    HAS_ONNXRUNTIME = False
+
+
+# SSD detector input size, COCO class id of 'person' and the minimum
+# detection score counted as a person
+SSD_INPUT_SIZE = 300
+SSD_PERSON_CLASS = 1
+SSD_SCORE_THRESHOLD = 0.5
+
+# HOG runs on frames shrunk by up to half toward this long edge (pixels),
+# never enlarged: native frames are halved as before, while frames the
+# segment processor already downscaled to 720 are not shrunk again
+HOG_LONG_EDGE = 720
+
+
+@functools.lru_cache(maxsize=None)
+def get_people_detector() -> cv2.HOGDescriptor:
+    """
+    Get the process-wide HOG + SVM people detector.
+    
+    Loading the default people SVM is the costly part of creating the
+    metric, so every PersonDetectionMetric shares one detector.
+    detectMultiScale() does not modify it, so it is safe across threads.
+    """
+    hog = cv2.HOGDescriptor()
+    hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+    return hog
+
+
+@functools.lru_cache(maxsize=None)
+def get_onnx_session(model_path: str):
+    """
+    Get the process-wide ONNX Runtime session of a detector model.
+    
+    Uses the CUDA execution provider when available, else the CPU.
+    InferenceSession.run() is safe to call from several threads.
+    """
+    if not HAS_ONNXRUNTIME:
+        raise ImportError("ONNX person detection requires ONNX Runtime (pip install onnxruntime)")
+    
+    available = onnxruntime.get_available_providers()
+    providers = [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider') if p in available]
+    return onnxruntime.InferenceSession(model_path, providers=providers)
 
 
 class PersonDetectionMetric(BaseMetric):
     """
-    Detect people in frames using HOG + SVM.
+    Detect people in frames using HOG + SVM, or an SSD model.
     
     Returns two scores:
     1. Person score - How well a person is detected and sized
@@ -22,12 +75,27 @@ class PersonDetectionMetric(BaseMetric):
     Range: Each score from 0.0 to 1.0
     """
     
-    def __init__(self):
+    def __init__(self, model_path: Optional[str] = None):
+        """
+        Args:
+            model_path: ONNX SSD person detector to use instead of HOG, in
+                the TensorFlow Object Detection API export layout (e.g.
+                ssd_mobilenet_v1 from the ONNX model zoo, optionally int8
+                quantized): detection_boxes/classes/scores outputs with
+                normalized [ymin, xmin, ymax, xmax] boxes and COCO class
+                ids. Requires onnxruntime. Default: HOG + SVM.
+        """
         super().__init__()
         
-        # Initialize HOG person detector
-        self.hog = cv2.HOGDescriptor()
-        self.hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+        # Shared person detector
+        self.model_path = model_path
+        self.session = None
+        self.hog = None
+        if model_path is not None:
+            self.session = get_onnx_session(str(model_path))
+            self._init_ssd_io()
+        else:
+            self.hog = get_people_detector()
         
         # Optimal person coverage (20-60% of frame)
         self.optimal_coverage_min = 0.15
@@ -43,11 +111,14 @@ class PersonDetectionMetric(BaseMetric):
         Returns:
             Tuple of (person_score, center_focus_score)
         """
+        if self.session is not None:
+            return tuple(self.calculate_batch(frame[np.newaxis])[0].tolist())
+        
         h, w = frame.shape[:2]
         
         # Resize for faster detection
-        scale = 0.5
-        small_frame = cv2.resize(frame, None, fx=scale, fy=scale)
+        scale = min(1.0, max(0.5, HOG_LONG_EDGE / max(h, w)))
+        small_frame = frame if scale == 1.0 else cv2.resize(frame, None, fx=scale, fy=scale)
         
         try:
             # Detect people
@@ -63,10 +134,10 @@ class PersonDetectionMetric(BaseMetric):
             if len(boxes) == 0:
                 return 0.0, 0.0
             
-            # Find largest detection (most prominent person)
-            max_idx = np.argmax([bw * bh for (bx, by, bw, bh) in boxes])
-            best_box = boxes[max_idx]
-            x, y, box_w, box_h = best_box
+            # Find largest detection (most prominent person); boxes is
+            # an (N, 4) int array, so the areas are one vectorized product
+            max_idx = int((boxes[:, 2] * boxes[:, 3]).argmax())
+            x, y, box_w, box_h = boxes[max_idx].tolist()
             
             # Scale back to original size
             x = int(x / scale)
@@ -90,6 +161,89 @@ class PersonDetectionMetric(BaseMetric):
             # If detection fails, return neutral scores
             return 0.5, 0.5
     
+    def calculate_batch(self, frames: np.ndarray, executor=None, **kwargs) -> np.ndarray:
+        """
+        Calculate person detection and center focus scores for a stack of frames.
+        
+        With an SSD model the whole stack goes through one session.run();
+        with HOG each frame is detected separately.
+        
+        Args:
+            frames: Stack of video frames, shape (N, H, W, 3) (BGR format)
+            executor: Optional concurrent.futures executor. HOG releases
+                the GIL, so frames can be detected in parallel.
+            
+        Returns:
+            Array of shape (N, 2) of (person_score, center_focus_score)
+        """
+        if self.session is None:
+            # One detectMultiScale call per frame: tiling frames side by
+            # side into one image measured 10-25% slower, as the wider
+            # pyramid levels fall out of cache, and it serializes frames
+            # that the executor can detect in parallel
+            if executor is not None:
+                results = list(executor.map(self.calculate, frames))
+            else:
+                results = [self.calculate(frame) for frame in frames]
+            return np.array(results, dtype=np.float32).reshape(len(results), 2)
+        
+        scores = np.zeros((len(frames), 2), dtype=np.float32)
+        if len(frames) == 0:
+            return scores
+        
+        h, w = frames.shape[1:3]
+        detections = self.session.run(self._output_names,
+                                      {self._input_name: self._ssd_input(frames)})
+        
+        for i, (boxes, classes, confidences) in enumerate(zip(*detections)):
+            boxes = boxes[(classes == SSD_PERSON_CLASS) & (confidences >= SSD_SCORE_THRESHOLD)]
+            if len(boxes) == 0:
+                continue
+            
+            # Largest detection (most prominent person), in frame pixels
+            ymin, xmin, ymax, xmax = boxes[np.argmax(
+                (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+            )]
+            x, y = int(xmin * w), int(ymin * h)
+            box_w, box_h = int((xmax - xmin) * w), int((ymax - ymin) * h)
+            
+            scores[i] = (self._calculate_person_score(box_w, box_h, w, h),
+                         self._calculate_center_focus(x, y, box_w, box_h, w, h))
+        
+        return scores
+    
+    def _init_ssd_io(self):
+        """Read the input layout and output names of the SSD model"""
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._input_float = model_input.type == 'tensor(float)'
+        self._input_nchw = model_input.shape[1] == 3
+        
+        # Boxes, classes and scores outputs, found by name as exports
+        # suffix them (e.g. 'detection_boxes:0')
+        names = [output.name for output in self.session.get_outputs()]
+        self._output_names = []
+        for role in ('detection_boxes', 'detection_classes', 'detection_scores'):
+            matches = [name for name in names if role in name]
+            if not matches:
+                raise ValueError(f"{self.model_path} has no {role} output")
+            self._output_names.append(matches[0])
+    
+    def _ssd_input(self, frames: np.ndarray) -> np.ndarray:
+        """Resize a BGR stack to the SSD input: RGB, in the model's dtype and layout"""
+        batch = np.empty((len(frames), SSD_INPUT_SIZE, SSD_INPUT_SIZE, 3), dtype=np.uint8)
+        for frame, resized in zip(frames, batch):
+            cv2.resize(frame, (SSD_INPUT_SIZE, SSD_INPUT_SIZE), dst=resized,
+                       interpolation=cv2.INTER_AREA)
+        batch = convert_stack(batch, cv2.COLOR_BGR2RGB)
+        
+        if self._input_float:
+            # MobileNet preprocessing: [0, 255] -> [-1, 1]
+            batch = batch.astype(np.float32) * (1 / 127.5) - 1.0
+        if self._input_nchw:
+            batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+        return batch
+    
     def _calculate_person_score(self, box_w: int, box_h: int, 
                                 frame_w: int, frame_h: int) -> float:
         """
@@ -101,20 +255,16 @@ class PersonDetectionMetric(BaseMetric):
         frame_area = frame_w * frame_h
         coverage = person_area / frame_area
         
-        # Score based on coverage
-        if coverage < self.optimal_coverage_min:
-            # Too small - person is far away
-            score = (coverage / self.optimal_coverage_min) * 0.6
-        elif coverage > self.optimal_coverage_max:
-            # Too large - person is too close
-            score = max(0.3, 1.0 - (coverage - self.optimal_coverage_max) / 0.3)
-        else:
-            # Optimal range
-            range_size = self.optimal_coverage_max - self.optimal_coverage_min
-            position = (coverage - self.optimal_coverage_min) / range_size
-            score = 0.6 + (min(position, 0.4) * 1.0)
+        # Score based on coverage, as one clamped linear interpolation:
+        # too small (person far away) rises to 0.6 at optimal_coverage_min,
+        # the optimal range reaches 1.0 40% of the way in, and too large
+        # (person too close) falls to 0.3 over 0.21 of coverage
+        low, high = self.optimal_coverage_min, self.optimal_coverage_max
+        score = np.interp(coverage,
+                          (0.0, low, low + 0.4 * (high - low), high, high + 0.21),
+                          (0.0, 0.6, 1.0, 1.0, 0.3))
         
-        return max(0.0, min(1.0, score))
+        return float(score)
     
     def _calculate_center_focus(self, x: int, y: int, box_w: int, box_h: int,
                                 frame_w: int, frame_h: int) -> float:
@@ -134,7 +284,7 @@ class PersonDetectionMetric(BaseMetric):
         # Calculate normalized distance from center
         dist_x = abs(person_center_x - frame_center_x) / (frame_w / 2)
         dist_y = abs(person_center_y - frame_center_y) / (frame_h / 2)
-        center_distance = np.sqrt(dist_x**2 + dist_y**2)
+        center_distance = math.hypot(dist_x, dist_y)
         
         # Score decreases as distance from center increases
         score = max(0.0, 1.0 - center_distance * 0.8)
@@ -142,4 +292,5 @@ class PersonDetectionMetric(BaseMetric):
         return score
     
     def get_description(self) -> str:
-        return "Detects people and scores based on size and centering using HOG + SVM"
+        detector = "an SSD model" if self.session is not None else "HOG + SVM"
+        return f"Detects people and scores based on size and centering using {detector}"
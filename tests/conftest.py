@@ -0,0 +1,39 @@
+"""
+Shared fixtures of the index format tests.
+"""
+
+import pytest
+
+from core.data_models import (
+    CameraMoveType,
+    ColorGradingStyle,
+    LightingType,
+    ScoreMetrics,
+    ShotFramingType,
+    VideoSegment,
+)
+
+
+@pytest.fixture
+def segments():
+    """
+    Segments of two videos with non-default metrics, categories and flags.
+    
+    Scores are multiples of 1/8 so they survive float32 columns exactly.
+    """
+    result = []
+    for i in range(6):
+        metrics = ScoreMetrics(
+            sharpness=i / 8, brightness=0.5, motion_score=1 - i / 8,
+            focus_sharpness=100.0 + i, color_warmth=128.0,
+            camera_movement_type=CameraMoveType(i % 3),
+            lighting_type=LightingType.GOLDEN_HOUR,
+            color_grading_style=ColorGradingStyle(i % 2),
+            shot_framing_type=ShotFramingType.CLOSE_UP
+        )
+        metrics.focus_has_bokeh = i % 2 == 0
+        metrics.exposure_is_well_exposed = i % 3 != 0
+        
+        video_file = 'first.mp4' if i < 4 else 'second.mp4'
+        result.append(VideoSegment(video_file, i * 1.5, i * 1.5 + 1.5, 1.5, metrics))
+    return result
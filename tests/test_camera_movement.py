@@ -0,0 +1,35 @@
+"""
+Camera movement classification on synthetic frame pairs.
+"""
+
+import cv2
+import numpy as np
+
+from metrics.cinematic.camera_movement_metric import CameraMovementMetric
+
+
+def _shifted_pair(blur_sigma: float, shift: int):
+    """Two 640x360 BGR views of one random texture, the second `shift` pixels to the right"""
+    rng = np.random.default_rng(1)
+    texture = rng.integers(0, 256, (420, 700), dtype=np.uint8)
+    texture = cv2.GaussianBlur(texture, (0, 0), blur_sigma)
+    texture = cv2.normalize(texture, None, 0, 255, cv2.NORM_MINMAX)
+    
+    prev_frame = texture[20:380, 20:660]
+    frame = texture[20:380, 20 + shift:660 + shift]
+    return (cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_GRAY2BGR),
+            cv2.cvtColor(np.ascontiguousarray(prev_frame), cv2.COLOR_GRAY2BGR))
+
+
+def test_pan_on_textured_frames():
+    frame, prev_frame = _shifted_pair(blur_sigma=3, shift=6)
+    result = CameraMovementMetric().calculate(frame, prev_frame=prev_frame)
+    assert result['movement_type'] == 'Pan Left'
+
+
+def test_pan_on_low_texture_frames():
+    # Too soft for FAST to find corners, so tracking falls back to
+    # goodFeaturesToTrack
+    frame, prev_frame = _shifted_pair(blur_sigma=15, shift=6)
+    result = CameraMovementMetric().calculate(frame, prev_frame=prev_frame)
+    assert result['movement_type'] == 'Pan Left'
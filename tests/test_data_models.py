@@ -0,0 +1,49 @@
+"""
+ScoreMetrics serialization and flag bits.
+"""
+
+from core.data_models import (
+    FLAG_EXPOSURE_IS_WELL_EXPOSED,
+    FLAG_FOCUS_HAS_BOKEH,
+    ScoreMetrics,
+    VideoSegment,
+)
+
+
+def test_flag_properties_set_bits():
+    metrics = ScoreMetrics()
+    assert metrics.flags == FLAG_EXPOSURE_IS_WELL_EXPOSED
+    assert metrics.exposure_is_well_exposed and not metrics.focus_has_bokeh
+    
+    metrics.focus_has_bokeh = True
+    metrics.exposure_is_well_exposed = False
+    assert metrics.flags == FLAG_FOCUS_HAS_BOKEH
+    assert metrics.focus_has_bokeh and not metrics.exposure_is_well_exposed
+
+
+def test_compact_round_trip(segments):
+    for segment in segments:
+        data = segment.metrics.to_dict()
+        assert data['flags'] == segment.metrics.flags
+        assert isinstance(data['camera_movement_type'], int)
+        assert ScoreMetrics.from_dict(data) == segment.metrics
+
+
+def test_verbose_round_trip(segments):
+    for segment in segments:
+        data = segment.metrics.to_dict(verbose=True)
+        assert 'flags' not in data
+        assert data['focus_has_bokeh'] == segment.metrics.focus_has_bokeh
+        assert data['camera_movement_type'] == segment.metrics.camera_movement_type.label
+        assert ScoreMetrics.from_dict(data) == segment.metrics
+
+
+def test_named_flags_override_flags_field():
+    metrics = ScoreMetrics.from_dict({'flags': 0, 'lighting_is_dramatic': True})
+    assert metrics.lighting_is_dramatic
+    assert not metrics.exposure_is_well_exposed
+
+
+def test_segment_round_trip(segments):
+    for verbose in (False, True):
+        assert [VideoSegment.from_dict(s.to_dict(verbose)) for s in segments] == segments
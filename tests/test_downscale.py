@@ -0,0 +1,48 @@
+"""
+Metrics of downscaled frames against the same frames at native resolution.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from core.segment_processor import SegmentProcessor
+
+
+@pytest.fixture(scope='module')
+def segment():
+    """
+    A short 1920x1080 pan over two subjects on a grainy background,
+    slightly soft like camera footage (the detail the downscale keeps)
+    """
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(rng.normal(0, 1, (1080, 2000)).astype(np.float32), (0, 0), 1)
+    picture = np.clip(texture * (10 / texture.std()) + 128, 0, 255).astype(np.uint8)
+    cv2.circle(picture, (700, 540), 110, 230, -1, cv2.LINE_AA)
+    cv2.rectangle(picture, (1200, 300), (1500, 800), 40, -1, cv2.LINE_AA)
+    picture = cv2.cvtColor(cv2.GaussianBlur(picture, (0, 0), 0.8), cv2.COLOR_GRAY2BGR)
+    return [np.ascontiguousarray(picture[:, 4 * i:1920 + 4 * i]) for i in range(13)]
+
+
+@pytest.fixture(scope='module')
+def native(segment):
+    return SegmentProcessor(downscale_long_edge=0).process_segment(segment)
+
+
+@pytest.fixture(scope='module')
+def downscaled(segment):
+    return SegmentProcessor(downscale_long_edge=720).process_segment(segment)
+
+
+def test_sharpness_agrees(native, downscaled):
+    assert downscaled.sharpness == pytest.approx(native.sharpness, rel=0.3)
+    assert downscaled.focus_sharpness == pytest.approx(native.focus_sharpness, rel=0.3)
+
+
+def test_motion_agrees(native, downscaled):
+    assert downscaled.motion_score == pytest.approx(native.motion_score, abs=0.1)
+    assert downscaled.camera_movement_type == native.camera_movement_type
+
+
+def test_shot_framing_agrees(native, downscaled):
+    assert downscaled.shot_framing_type == native.shot_framing_type
@@ -0,0 +1,78 @@
+"""
+Index file round trips through dump_index() and load_index().
+"""
+
+import pytest
+
+from core.data_models import VideoSegment
+from core.index_io import IndexWriter, dump_index, iter_index_segments, load_index
+
+
+def _index(segments):
+    return {
+        'metadata': {'total_videos': 2, 'total_segments': len(segments)},
+        'videos': {'first.mp4': {'fps': 30.0}, 'second.mp4': {'fps': 25.0}},
+        'segments': [segment.to_dict(verbose=True) for segment in segments],
+    }
+
+
+def test_json_round_trip(tmp_path, segments):
+    path = tmp_path / 'index.json'
+    dump_index(path, _index(segments))
+    
+    assert load_index(path) == _index(segments)
+
+
+@pytest.mark.parametrize('suffix', ['.msgpack', '.mpk'])
+def test_msgpack_round_trip(tmp_path, segments, suffix):
+    pytest.importorskip('msgpack')
+    path = tmp_path / f'index{suffix}'
+    dump_index(path, _index(segments))
+    
+    index = load_index(path)
+    assert index == _index(segments)
+    assert [VideoSegment.from_dict(seg) for seg in index['segments']] == segments
+
+
+@pytest.mark.parametrize('suffix', ['.ndjson', '.jsonl'])
+def test_ndjson_round_trip(tmp_path, segments, suffix):
+    path = tmp_path / f'index{suffix}'
+    dump_index(path, _index(segments))
+    
+    assert load_index(path) == _index(segments)
+    assert list(iter_index_segments(path)) == _index(segments)['segments']
+
+
+def test_ndjson_writer_streams_segments(tmp_path, segments):
+    path = tmp_path / 'index.ndjson'
+    index = _index(segments)
+    
+    writer = IndexWriter(path)
+    writer.add_segments(segments[:4])
+    writer.add_segments(segments[4:])
+    assert 'segments' not in writer.close(index['metadata'], index['videos'])
+    
+    assert writer.segment_count == len(segments)
+    assert load_index(path) == index
+
+
+def test_parquet_round_trip(tmp_path, segments):
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'index.parquet'
+    dump_index(path, _index(segments))
+    
+    assert load_index(path) == _index(segments)
+
+
+def test_parquet_writer(tmp_path, segments):
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'index.parquet'
+    index = _index(segments)
+    
+    writer = IndexWriter(path)
+    writer.add_segments(segments[:4])
+    writer.add_segments([])
+    writer.add_segments(segments[4:])
+    writer.close(index['metadata'], index['videos'])
+    
+    assert load_index(path) == index
@@ -0,0 +1,48 @@
+"""
+SegmentCache get/put round trips.
+"""
+
+from core.data_models import CameraMoveType, ScoreMetrics, ShotFramingType
+from core.segment_cache import SegmentCache
+
+
+VIDEO_HASH = bytes(range(16))
+
+
+def _metrics() -> ScoreMetrics:
+    metrics = ScoreMetrics(
+        sharpness=0.25, motion_score=0.75, focus_sharpness=123.5,
+        camera_movement_type=CameraMoveType.PAN_LEFT,
+        shot_framing_type=ShotFramingType.CLOSE_UP
+    )
+    metrics.focus_has_bokeh = True
+    metrics.exposure_is_well_exposed = False
+    return metrics
+
+
+def test_put_then_get(tmp_path):
+    cache = SegmentCache(tmp_path / 'cache.db')
+    cache.put(VIDEO_HASH, 0.0, 1.0, _metrics())
+    
+    assert cache.get(VIDEO_HASH, 0.0, 1.0) == _metrics()
+    assert cache.get(VIDEO_HASH, 1.0, 2.0) is None
+    assert cache.get(bytes(16), 0.0, 1.0) is None
+    cache.close()
+
+
+def test_committed_entries_persist(tmp_path):
+    cache = SegmentCache(tmp_path / 'cache.db')
+    cache.put(VIDEO_HASH, 0.0, 1.0, _metrics())
+    cache.commit()
+    
+    # A second connection, as a parallel worker or a later run opens
+    assert SegmentCache(tmp_path / 'cache.db').get(VIDEO_HASH, 0.0, 1.0) == _metrics()
+    cache.close()
+
+
+def test_other_metric_version_misses(tmp_path):
+    cache = SegmentCache(tmp_path / 'cache.db', metric_version=1)
+    cache.put(VIDEO_HASH, 0.0, 1.0, _metrics())
+    cache.close()
+    
+    assert SegmentCache(tmp_path / 'cache.db', metric_version=2).get(VIDEO_HASH, 0.0, 1.0) is None
@@ -0,0 +1,55 @@
+"""
+SegmentOverlapIndex against pairwise VideoSegment.overlaps_with().
+"""
+
+import itertools
+
+import numpy as np
+
+from core.data_models import ScoreMetrics, VideoSegment
+from core.segment_index import SegmentOverlapIndex
+
+
+def _random_segments(count: int, seed: int = 0):
+    """Segments of mixed lengths (some zero) over three videos"""
+    rng = np.random.default_rng(seed)
+    segments = []
+    for _ in range(count):
+        start = round(float(rng.uniform(0, 60)), 3)
+        duration = round(float(rng.choice([0.0, 0.5, 1.0, 2.0, 7.5])), 3)
+        video_file = f"video_{rng.integers(3)}.mp4"
+        segments.append(VideoSegment(video_file, start, start + duration, duration, ScoreMetrics()))
+    return segments
+
+
+def test_all_overlap_pairs_matches_pairwise():
+    segments = _random_segments(300)
+    expected = [
+        (i, j) for i, j in itertools.combinations(range(len(segments)), 2)
+        if segments[i].overlaps_with(segments[j])
+    ]
+    assert SegmentOverlapIndex(segments).all_overlap_pairs() == expected
+
+
+def test_find_overlaps_matches_pairwise():
+    segments = _random_segments(300, seed=1)
+    index = SegmentOverlapIndex(segments)
+    
+    for segment in segments[:50]:
+        expected = [other for other in segments
+                    if other is not segment and segment.overlaps_with(other)]
+        found = index.find_overlaps(segment)
+        assert sorted(map(id, found)) == sorted(map(id, expected))
+
+
+def test_find_overlaps_of_unindexed_segment():
+    segments = [
+        VideoSegment("a.mp4", 0.0, 1.0, 1.0, ScoreMetrics()),
+        VideoSegment("a.mp4", 1.0, 2.0, 1.0, ScoreMetrics()),
+        VideoSegment("b.mp4", 0.0, 2.0, 2.0, ScoreMetrics()),
+    ]
+    index = SegmentOverlapIndex(segments)
+    
+    query = VideoSegment("a.mp4", 0.5, 1.5, 1.0, ScoreMetrics())
+    assert index.find_overlaps(query) == segments[:2]
+    assert index.find_overlaps(VideoSegment("c.mp4", 0.0, 9.0, 9.0, ScoreMetrics())) == []
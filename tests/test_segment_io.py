@@ -0,0 +1,39 @@
+"""
+Arrow/Parquet export round trips.
+"""
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from core.segment_io import (
+    read_parquet_metadata,
+    read_segments_parquet,
+    segments_to_arrow,
+    write_segments_parquet,
+)
+
+
+def test_parquet_round_trip(tmp_path, segments):
+    path = tmp_path / 'segments.parquet'
+    write_segments_parquet(segments, path, metadata={'version': 1})
+    
+    assert read_segments_parquet(path) == segments
+    assert read_parquet_metadata(path) == {'version': 1}
+
+
+def test_parquet_without_metadata(tmp_path, segments):
+    path = tmp_path / 'segments.parquet'
+    write_segments_parquet(segments, path)
+    
+    assert read_parquet_metadata(path) is None
+
+
+def test_arrow_columns(segments):
+    batch = segments_to_arrow(segments)
+    
+    assert batch.num_rows == len(segments)
+    assert batch.column('camera_movement_type').to_pylist() == [
+        segment.metrics.camera_movement_type.label for segment in segments
+    ]
+    assert batch.column('flags').to_pylist() == [segment.metrics.flags for segment in segments]